@@ -5,10 +5,30 @@ d = { 'settings': { 'branch': 'master',
                 'doc_host': 'https://FleischerResearchLab.github.io',
                 'git_url': 'https://github.com/FleischerResearchLab/treets/',
                 'lib_path': 'treets'},
-  'syms': { 'treets.core': { 'treets.core.FoodParser': ('core.html#foodparser', 'treets/core.py'),
+  'syms': { 'treets.core': { 'treets.core.DayTable': ('core.html#daytable', 'treets/core.py'),
+                             'treets.core.DayTable.__init__': ('core.html#daytable.__init__', 'treets/core.py'),
+                             'treets.core.DayTable.__repr__': ('core.html#daytable.__repr__', 'treets/core.py'),
+                             'treets.core.DayTable.caloric_series': ('core.html#daytable.caloric_series', 'treets/core.py'),
+                             'treets.core.DayTable.good_logging': ('core.html#daytable.good_logging', 'treets/core.py'),
+                             'treets.core.FoodParser': ('core.html#foodparser', 'treets/core.py'),
                              'treets.core.FoodParser.__init__': ('core.html#foodparser.__init__', 'treets/core.py'),
+                             'treets.core.FoodParser._cached_parse_entry': ('core.html#foodparser._cached_parse_entry', 'treets/core.py'),
+                             'treets.core.FoodParser._fast_tokenize': ('core.html#foodparser._fast_tokenize', 'treets/core.py'),
+                             'treets.core.FoodParser._normalize_entry': ('core.html#foodparser._normalize_entry', 'treets/core.py'),
+                             'treets.core.FoodParser._parallel_parse_entries': ( 'core.html#foodparser._parallel_parse_entries',
+                                                                                 'treets/core.py'),
+                             'treets.core.FoodParser._parse_distinct': ('core.html#foodparser._parse_distinct', 'treets/core.py'),
                              'treets.core.FoodParser._parse_food': ('core.html#foodparser._parse_food', 'treets/core.py'),
+                             'treets.core.FoodParser._parse_tokens': ('core.html#foodparser._parse_tokens', 'treets/core.py'),
+                             'treets.core.FoodParser._resolve_token': ('core.html#foodparser._resolve_token', 'treets/core.py'),
+                             'treets.core.FoodParser.annotate': ('core.html#foodparser.annotate', 'treets/core.py'),
+                             'treets.core.FoodParser.batch_normalize': ('core.html#foodparser.batch_normalize', 'treets/core.py'),
+                             'treets.core.FoodParser.build_gram_trie': ('core.html#foodparser.build_gram_trie', 'treets/core.py'),
                              'treets.core.FoodParser.clean_format': ('core.html#foodparser.clean_format', 'treets/core.py'),
+                             'treets.core.FoodParser.clear_parse_cache': ('core.html#foodparser.clear_parse_cache', 'treets/core.py'),
+                             'treets.core.FoodParser.compile_dictionary': ('core.html#foodparser.compile_dictionary', 'treets/core.py'),
+                             'treets.core.FoodParser.compiled_dictionary_path': ( 'core.html#foodparser.compiled_dictionary_path',
+                                                                                  'treets/core.py'),
                              'treets.core.FoodParser.drop_punc': ('core.html#foodparser.drop_punc', 'treets/core.py'),
                              'treets.core.FoodParser.expand_entries': ('core.html#foodparser.expand_entries', 'treets/core.py'),
                              'treets.core.FoodParser.find_food_type': ('core.html#foodparser.find_food_type', 'treets/core.py'),
@@ -17,15 +37,74 @@ d = { 'settings': { 'branch': 'master',
                              'treets.core.FoodParser.handle_front_mixing': ('core.html#foodparser.handle_front_mixing', 'treets/core.py'),
                              'treets.core.FoodParser.handle_numbers': ('core.html#foodparser.handle_numbers', 'treets/core.py'),
                              'treets.core.FoodParser.handle_x2': ('core.html#foodparser.handle_x2', 'treets/core.py'),
+                             'treets.core.FoodParser.lemmatize': ('core.html#foodparser.lemmatize', 'treets/core.py'),
+                             'treets.core.FoodParser.load_compiled_dictionary': ( 'core.html#foodparser.load_compiled_dictionary',
+                                                                                  'treets/core.py'),
+                             'treets.core.FoodParser.load_token_table': ('core.html#foodparser.load_token_table', 'treets/core.py'),
+                             'treets.core.FoodParser.match_grams': ('core.html#foodparser.match_grams', 'treets/core.py'),
+                             'treets.core.FoodParser.normalize_tokens': ('core.html#foodparser.normalize_tokens', 'treets/core.py'),
+                             'treets.core.FoodParser.parse_cache_info': ('core.html#foodparser.parse_cache_info', 'treets/core.py'),
+                             'treets.core.FoodParser.parse_entry': ('core.html#foodparser.parse_entry', 'treets/core.py'),
                              'treets.core.FoodParser.parse_food': ('core.html#foodparser.parse_food', 'treets/core.py'),
                              'treets.core.FoodParser.parse_single_entry': ('core.html#foodparser.parse_single_entry', 'treets/core.py'),
                              'treets.core.FoodParser.parse_single_gram': ('core.html#foodparser.parse_single_gram', 'treets/core.py'),
+                             'treets.core.FoodParser.parsed_items': ('core.html#foodparser.parsed_items', 'treets/core.py'),
                              'treets.core.FoodParser.pre_processing': ('core.html#foodparser.pre_processing', 'treets/core.py'),
+                             'treets.core.FoodParser.precompute_token_table': ( 'core.html#foodparser.precompute_token_table',
+                                                                                'treets/core.py'),
                              'treets.core.FoodParser.process_parser_keys_df': ( 'core.html#foodparser.process_parser_keys_df',
                                                                                 'treets/core.py'),
                              'treets.core.FoodParser.remove_stop': ('core.html#foodparser.remove_stop', 'treets/core.py'),
+                             'treets.core.FoodParser.resolve_token': ('core.html#foodparser.resolve_token', 'treets/core.py'),
+                             'treets.core.FoodParser.save_token_table': ('core.html#foodparser.save_token_table', 'treets/core.py'),
+                             'treets.core.FoodParser.source_hash': ('core.html#foodparser.source_hash', 'treets/core.py'),
+                             'treets.core.FoodParser.token_table_path': ('core.html#foodparser.token_table_path', 'treets/core.py'),
+                             'treets.core.FoodParser.validate_tokenizer': ('core.html#foodparser.validate_tokenizer', 'treets/core.py'),
+                             'treets.core.ParseResult': ('core.html#parseresult', 'treets/core.py'),
+                             'treets.core.ParseResult.__init__': ('core.html#parseresult.__init__', 'treets/core.py'),
+                             'treets.core.ParseResult.__repr__': ('core.html#parseresult.__repr__', 'treets/core.py'),
+                             'treets.core.ParseResult.num_tokens': ('core.html#parseresult.num_tokens', 'treets/core.py'),
+                             'treets.core.ParseResult.num_unknown': ('core.html#parseresult.num_unknown', 'treets/core.py'),
+                             'treets.core.ParseResult.to_legacy': ('core.html#parseresult.to_legacy', 'treets/core.py'),
+                             'treets.core.ParseResult.unknown_tokens': ('core.html#parseresult.unknown_tokens', 'treets/core.py'),
+                             'treets.core._TagMatrixView': ('core.html#_tagmatrixview', 'treets/core.py'),
+                             'treets.core._TagMatrixView.__getitem__': ('core.html#_tagmatrixview.__getitem__', 'treets/core.py'),
+                             'treets.core._TagMatrixView.__init__': ('core.html#_tagmatrixview.__init__', 'treets/core.py'),
+                             'treets.core._TagMatrixView.__iter__': ('core.html#_tagmatrixview.__iter__', 'treets/core.py'),
+                             'treets.core._TagMatrixView.__len__': ('core.html#_tagmatrixview.__len__', 'treets/core.py'),
+                             'treets.core._TagMatrixView.__repr__': ('core.html#_tagmatrixview.__repr__', 'treets/core.py'),
+                             'treets.core._as_datetime64_dates': ('core.html#_as_datetime64_dates', 'treets/core.py'),
+                             'treets.core._cache_file': ('core.html#_cache_file', 'treets/core.py'),
+                             'treets.core._cache_versions': ('core.html#_cache_versions', 'treets/core.py'),
+                             'treets.core._daily_metrics_core': ('core.html#_daily_metrics_core', 'treets/core.py'),
+                             'treets.core._earliest_caloric': ('core.html#_earliest_caloric', 'treets/core.py'),
+                             'treets.core._flag_lwa_days': ('core.html#_flag_lwa_days', 'treets/core.py'),
+                             'treets.core._float_hours': ('core.html#_float_hours', 'treets/core.py'),
+                             'treets.core._init_parse_worker': ('core.html#_init_parse_worker', 'treets/core.py'),
+                             'treets.core._iter_data_pieces': ('core.html#_iter_data_pieces', 'treets/core.py'),
+                             'treets.core._load_nlp_resources': ('core.html#_load_nlp_resources', 'treets/core.py'),
+                             'treets.core._log_days': ('core.html#_log_days', 'treets/core.py'),
+                             'treets.core._lwa_counts_and_dates': ('core.html#_lwa_counts_and_dates', 'treets/core.py'),
+                             'treets.core._lwa_day_flags': ('core.html#_lwa_day_flags', 'treets/core.py'),
+                             'treets.core._parse_entry_chunk': ('core.html#_parse_entry_chunk', 'treets/core.py'),
+                             'treets.core._phase_summary_core': ('core.html#_phase_summary_core', 'treets/core.py'),
+                             'treets.core._read_cache': ('core.html#_read_cache', 'treets/core.py'),
+                             'treets.core._read_data_file': ('core.html#_read_data_file', 'treets/core.py'),
+                             'treets.core._reduce_days': ('core.html#_reduce_days', 'treets/core.py'),
+                             'treets.core._resolve_cache_dir': ('core.html#_resolve_cache_dir', 'treets/core.py'),
+                             'treets.core._shifted_day_ordinals': ('core.html#_shifted_day_ordinals', 'treets/core.py'),
+                             'treets.core._single_group_metric': ('core.html#_single_group_metric', 'treets/core.py'),
+                             'treets.core._source_signature': ('core.html#_source_signature', 'treets/core.py'),
+                             'treets.core._tag_logs_with_phases': ('core.html#_tag_logs_with_phases', 'treets/core.py'),
+                             'treets.core._wall_clock_ns': ('core.html#_wall_clock_ns', 'treets/core.py'),
+                             'treets.core._window_bounds': ('core.html#_window_bounds', 'treets/core.py'),
+                             'treets.core._wordsegment': ('core.html#_wordsegment', 'treets/core.py'),
+                             'treets.core._write_cache': ('core.html#_write_cache', 'treets/core.py'),
                              'treets.core.clean_loggings': ('core.html#clean_loggings', 'treets/core.py'),
                              'treets.core.count_caloric_entries': ('core.html#count_caloric_entries', 'treets/core.py'),
+                             'treets.core.daily_metrics': ('core.html#daily_metrics', 'treets/core.py'),
+                             'treets.core.derive_time_features': ('core.html#derive_time_features', 'treets/core.py'),
+                             'treets.core.download_nlp_resources': ('core.html#download_nlp_resources', 'treets/core.py'),
                              'treets.core.earliest_entry': ('core.html#earliest_entry', 'treets/core.py'),
                              'treets.core.eating_intervals_percentile': ('core.html#eating_intervals_percentile', 'treets/core.py'),
                              'treets.core.file_loader': ('core.html#file_loader', 'treets/core.py'),
@@ -41,8 +120,12 @@ d = { 'settings': { 'branch': 'master',
                              'treets.core.first_cal_mean_with_error_bar': ('core.html#first_cal_mean_with_error_bar', 'treets/core.py'),
                              'treets.core.first_cal_sample_distplot': ('core.html#first_cal_sample_distplot', 'treets/core.py'),
                              'treets.core.get_types': ('core.html#get_types', 'treets/core.py'),
+                             'treets.core.good_logging_day_table': ('core.html#good_logging_day_table', 'treets/core.py'),
                              'treets.core.good_lwa_day_counts': ('core.html#good_lwa_day_counts', 'treets/core.py'),
+                             'treets.core.good_lwa_day_flags': ('core.html#good_lwa_day_flags', 'treets/core.py'),
                              'treets.core.in_good_logging_day': ('core.html#in_good_logging_day', 'treets/core.py'),
+                             'treets.core.iter_file_loader': ('core.html#iter_file_loader', 'treets/core.py'),
+                             'treets.core.iter_load_food_data': ('core.html#iter_load_food_data', 'treets/core.py'),
                              'treets.core.last_cal_analysis_summary': ('core.html#last_cal_analysis_summary', 'treets/core.py'),
                              'treets.core.last_cal_analysis_variability_plot': ( 'core.html#last_cal_analysis_variability_plot',
                                                                                  'treets/core.py'),
@@ -56,6 +139,7 @@ d = { 'settings': { 'branch': 'master',
                              'treets.core.mean_daily_eating_occasions': ('core.html#mean_daily_eating_occasions', 'treets/core.py'),
                              'treets.core.mean_first_cal': ('core.html#mean_first_cal', 'treets/core.py'),
                              'treets.core.mean_last_cal': ('core.html#mean_last_cal', 'treets/core.py'),
+                             'treets.core.parse_logtimes': ('core.html#parse_logtimes', 'treets/core.py'),
                              'treets.core.prepare_baseline_and_intervention_usable_data': ( 'core.html#prepare_baseline_and_intervention_usable_data',
                                                                                             'treets/core.py'),
                              'treets.core.std_daily_eating_duration': ('core.html#std_daily_eating_duration', 'treets/core.py'),
@@ -67,5 +151,6 @@ d = { 'settings': { 'branch': 'master',
                              'treets.core.summarize_data_with_experiment_phases': ( 'core.html#summarize_data_with_experiment_phases',
                                                                                     'treets/core.py'),
                              'treets.core.swarmplot': ('core.html#swarmplot', 'treets/core.py'),
+                             'treets.core.to_legacy_dates': ('core.html#to_legacy_dates', 'treets/core.py'),
                              'treets.core.users_sorted_by_logging': ('core.html#users_sorted_by_logging', 'treets/core.py'),
                              'treets.core.week_from_start': ('core.html#week_from_start', 'treets/core.py')}}}
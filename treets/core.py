@@ -3,17 +3,21 @@
 # %% ../00_core.ipynb 3
 # allows for type hinting annotations without breaking functionality
 from __future__ import annotations
-import matplotlib.figure
+import typing
+if typing.TYPE_CHECKING:
+    import matplotlib.figure
 
 # %% auto 0
-__all__ = ['file_loader', 'find_date', 'find_float_time', 'week_from_start', 'find_phase_duration', 'load_food_data',
-           'in_good_logging_day', 'FoodParser', 'clean_loggings', 'get_types', 'count_caloric_entries',
+__all__ = ['file_loader', 'iter_file_loader', 'find_date', 'find_float_time', 'week_from_start', 'find_phase_duration',
+           'parse_logtimes', 'derive_time_features', 'load_food_data', 'to_legacy_dates', 'iter_load_food_data',
+           'DayTable', 'in_good_logging_day', 'good_logging_day_table', 'download_nlp_resources', 'ParseResult',
+           'FoodParser', 'clean_loggings', 'get_types', 'count_caloric_entries', 'daily_metrics',
            'mean_daily_eating_duration', 'std_daily_eating_duration', 'earliest_entry', 'mean_first_cal',
            'std_first_cal', 'mean_last_cal', 'std_last_cal', 'mean_daily_eating_occasions',
            'std_daily_eating_occasions', 'mean_daily_eating_midpoint', 'std_daily_eating_midpoint',
-           'logging_day_counts', 'find_missing_logging_days', 'good_lwa_day_counts', 'filtering_usable_data',
-           'prepare_baseline_and_intervention_usable_data', 'users_sorted_by_logging', 'eating_intervals_percentile',
-           'first_cal_analysis_summary', 'last_cal_analysis_summary', 'summarize_data',
+           'logging_day_counts', 'find_missing_logging_days', 'good_lwa_day_flags', 'good_lwa_day_counts',
+           'filtering_usable_data', 'prepare_baseline_and_intervention_usable_data', 'users_sorted_by_logging',
+           'eating_intervals_percentile', 'first_cal_analysis_summary', 'last_cal_analysis_summary', 'summarize_data',
            'summarize_data_with_experiment_phases', 'first_cal_mean_with_error_bar', 'last_cal_mean_with_error_bar',
            'first_cal_analysis_variability_plot', 'last_cal_analysis_variability_plot', 'first_cal_avg_histplot',
            'first_cal_sample_distplot', 'last_cal_avg_histplot', 'last_cal_sample_distplot', 'swarmplot']
@@ -25,27 +29,142 @@ warnings.filterwarnings('ignore')
 import re
 import os
 import glob
+import json
+import pickle
+import hashlib
+import functools
+import collections
+import collections.abc
 import string
 import datetime
+import time
+import itertools
+import concurrent.futures
 import wordsegment
 
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 
-import nltk
-nltk.download('words', quiet=True)
-nltk.download('stopwords', quiet=True)
-nltk.download('wordnet', quiet=True)
-nltk.download('punkt', quiet=True)
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
+# nltk and the plotting libraries are imported when first needed, see FoodParser and the plotting functions
 
-wordsegment.load()
+# %% ../00_core.ipynb 7
+# version of the cached data produced by file_loader and load_food_data, bump whenever it changes
+# (2: load_food_data returns datetime64 dates and timedelta64 times instead of date and time objects)
+_CACHE_VERSION = 2
 
-# %% ../00_core.ipynb 6
-def file_loader(data_source:str|pd.DataFrame) -> pd.DataFrame:
+def _resolve_cache_dir(cache_dir:str|None) -> str|None:
+    """
+    Returns the cache folder to use, falling back to the 'TREETS_CACHE_DIR' environment variable.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get('TREETS_CACHE_DIR')
+    return cache_dir
+
+
+def _source_signature(path:str) -> dict:
+    """
+    Describes a source file by its absolute path, size and modification time.
+    """
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+
+def _cache_versions() -> dict:
+    """
+    Versions of the cache format and of the libraries whose conversions shape the cached dataframes. Included in
+    every cache signature so that entries written by other versions are recomputed instead of served stale.
+    """
+    try:
+        import pyarrow as pa
+        pyarrow_version = pa.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {'cache_version': _CACHE_VERSION, 'pandas': pd.__version__, 'pyarrow': pyarrow_version}
+
+
+def _cache_file(cache_dir:str, key:object) -> str:
+    """
+    Path of the columnar cache entry for a json serializable key.
+    """
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    return os.path.join(cache_dir, digest + '.feather')
+
+
+def _read_cache(cache_file:str, signature:object) -> pd.DataFrame|None:
+    """
+    Reads a cache entry into a dataframe, returning None if it is missing or was written for a different signature.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        raise ImportError("Caching loaded data requires pyarrow, which can be installed with 'pip install pyarrow'.")
+    
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        table = feather.read_table(cache_file)
+    except (OSError, pa.ArrowException):
+        return None
+    metadata = table.schema.metadata or {}
+    if metadata.get(b'treets_signature') != json.dumps(signature, sort_keys=True).encode():
+        return None
+    return table.to_pandas()
+
+
+def _write_cache(df:pd.DataFrame, cache_file:str, signature:object):
+    """
+    Writes a dataframe to a Feather cache entry tagged with the signature of its source(s). Dataframes
+    that cannot be represented in Arrow (e.g. mixed type object columns) are silently left uncached.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowException, TypeError, ValueError):
+        return
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'treets_signature'] = json.dumps(signature, sort_keys=True).encode()
+    table = table.replace_schema_metadata(metadata)
+    
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    # write then rename so concurrent readers never see a partially written entry
+    tmp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+    feather.write_feather(table, tmp_file)
+    os.replace(tmp_file, cache_file)
+
+# %% ../00_core.ipynb 8
+def _read_data_file(path:str,
+                    cache_dir:str|None = None) -> pd.DataFrame|None:
+    """
+    Reads a single .csv or .json file, reusing its columnar cache entry when one is up to date.
+    Files of any other type are skipped by returning None.
+    """
+    if cache_dir is not None:
+        cache_file = _cache_file(cache_dir, os.path.abspath(path))
+        signature = {'source': _source_signature(path), 'versions': _cache_versions()}
+        cached = _read_cache(cache_file, signature)
+        if cached is not None:
+            return cached
+    
+    if path[-4:] == '.csv':
+        df = pd.read_csv(path)
+    elif path[-5:] == '.json':
+        df = pd.read_json(path)
+    else:
+        return None
+    
+    if cache_dir is not None and isinstance(df, pd.DataFrame):
+        _write_cache(df, cache_file, signature)
+    return df
+
+
+def file_loader(data_source:str|pd.DataFrame,
+                n_jobs:int = 1,
+                backend:str = 'thread',
+                check_schema:bool|None = None,
+                cache_dir:str|None = None) -> pd.DataFrame:
     """
     Flexible file loader able to read a single file path or folder path.
     Accepts .csv and .json file format loading.
@@ -56,6 +175,20 @@ def file_loader(data_source:str|pd.DataFrame) -> pd.DataFrame:
         String file or folder path. Single .json or .csv paths create a pd.DataFrame. 
         Folder paths with files matching the input pattern are read together into a single pd.DataFrame.
         Existing dataframes are read as is.
+    n_jobs
+        Number of files to read concurrently. By default files are read one after another, -1 uses one
+        worker per available CPU. Files are concatenated in sorted path order regardless of the number of workers.
+    backend
+        Worker pool used when reading files concurrently. 'thread' suits folders of many small files,
+        'process' suits fewer, larger files where text parsing dominates.
+    check_schema
+        If True, raises a ValueError when the matched files do not all share the same columns instead of
+        concatenating them. By default the check is made whenever files are read concurrently, while serial
+        loads keep concatenating mixed files (filling missing columns with NaN).
+    cache_dir
+        Folder for a columnar (Feather) copy of each source file, keyed by the file's path, size and modification
+        time. Repeat loads read the cached copy instead of re-parsing text, and a changed file only
+        invalidates its own entry. Defaults to the 'TREETS_CACHE_DIR' environment variable, if set. Requires pyarrow.
         
         
     Returns
@@ -65,23 +198,165 @@ def file_loader(data_source:str|pd.DataFrame) -> pd.DataFrame:
     
     """
     if isinstance(data_source, str):
-        data_lst = glob.glob(data_source)
-        dfs = []
-        for x in data_lst:
-            if x[-4:] == '.csv':
-                dfs.append(pd.read_csv(x))
-            elif x[-5:] == '.json':
-                json_file = pd.read_json(x)
-                if not isinstance(json_file, pd.DataFrame):
-                    return json_file
-                dfs.append(json_file)
-        df = pd.concat(dfs).reset_index(drop=True)
+        # sorted so that row order does not depend on the file system's directory order
+        data_lst = [x for x in sorted(glob.glob(data_source)) if x[-4:] == '.csv' or x[-5:] == '.json']
+        read_file = functools.partial(_read_data_file, cache_dir = _resolve_cache_dir(cache_dir))
+        if n_jobs != -1 and n_jobs < 1:
+            raise ValueError("n_jobs must be -1 (one worker per CPU) or a positive number of workers, got {}.".format(n_jobs))
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+        if check_schema is None:
+            check_schema = n_jobs != 1
+        
+        if n_jobs == 1 or len(data_lst) < 2:
+            # lazily read files so that a non-dataframe .json file still returns early
+            dfs = map(read_file, data_lst)
+        else:
+            if backend == 'thread':
+                executor = concurrent.futures.ThreadPoolExecutor
+            elif backend == 'process':
+                executor = concurrent.futures.ProcessPoolExecutor
+            else:
+                raise ValueError("backend must be either 'thread' or 'process'.")
+            # map returns results in submission order, keeping row order deterministic
+            with executor(max_workers = min(n_jobs, len(data_lst))) as pool:
+                dfs = list(pool.map(read_file, data_lst))
+        
+        frames = []
+        for x, file_df in zip(data_lst, dfs):
+            if not isinstance(file_df, pd.DataFrame):
+                return file_df
+            if check_schema and len(frames) > 0 and set(file_df.columns) != set(frames[0].columns):
+                raise ValueError("'{}' does not have the same columns as '{}'.".format(x, data_lst[0]))
+            frames.append(file_df)
+        df = pd.concat(frames).reset_index(drop=True)
     else:
         df = data_source
 
     return df
 
-# %% ../00_core.ipynb 13
+# %% ../00_core.ipynb 21
+def _iter_data_pieces(data_source:str|pd.DataFrame,
+                      chunksize:int|None,
+                      cache_dir:str|None):
+    """
+    Yields the raw dataframes making up a data source, one per file or one per 'chunksize' rows.
+    """
+    if isinstance(data_source, pd.DataFrame):
+        frames = [data_source]
+    else:
+        frames = (x for x in sorted(glob.glob(data_source)) if x[-4:] == '.csv' or x[-5:] == '.json')
+    
+    for x in frames:
+        if isinstance(x, str) and chunksize is not None and x[-4:] == '.csv':
+            # csv files are streamed without ever being read in full
+            with pd.read_csv(x, chunksize = chunksize) as reader:
+                yield from reader
+            continue
+        df = x if isinstance(x, pd.DataFrame) else _read_data_file(x, cache_dir)
+        if chunksize is None:
+            yield df
+        else:
+            for start in range(0, df.shape[0], chunksize):
+                yield df.iloc[start:start + chunksize]
+
+
+def iter_file_loader(data_source:str|pd.DataFrame,
+                     chunksize:int|None = None,
+                     identifier:int = 1,
+                     cache_dir:str|None = None):
+    """
+    Iterator version of file_loader that yields bounded-size chunks of the data instead of a single dataframe.
+    Chunks always end on a participant boundary, so each participant's logs are contained within a single chunk
+    and per-participant calculations can be run chunk by chunk.
+    
+    Parameters
+    ----------
+    data_source
+        String file or folder path. Single .json or .csv paths create a pd.DataFrame. 
+        Folder paths with files matching the input pattern are read together into a single pd.DataFrame.
+        Existing dataframes are read as is.
+    chunksize
+        Approximate number of rows per chunk. By default each file is its own chunk. CSV files are streamed
+        'chunksize' rows at a time, while .json files are read whole before being split.
+    identifier
+        Column number for an existing unique identifier column in provided data source. Data exported from mCC typically
+        has a unique identifier as its 1st column (with indexing starting from 0). Rows for a participant are
+        expected to be contiguous, as they are in mCC exports.
+    cache_dir
+        Folder for a columnar cache of whole files, see file_loader. Streamed .csv chunks bypass the cache.
+        
+        
+    Yields
+    -------
+    chunk
+        Dataframe holding the logs of one or more complete participants. The index continues across chunks,
+        matching the index file_loader would give the same rows.
+    """
+    cache_dir = _resolve_cache_dir(cache_dir)
+    carry = None
+    offset = 0
+    for piece in _iter_data_pieces(data_source, chunksize, cache_dir):
+        if carry is not None:
+            piece = pd.concat([carry, piece])
+        ids = piece[piece.columns[identifier]].to_numpy()
+        # hold back the last participant in case their logs continue in the next piece
+        boundaries = np.flatnonzero(ids[1:] != ids[:-1])
+        cut = boundaries[-1] + 1 if len(boundaries) > 0 else 0
+        carry = piece.iloc[cut:]
+        if cut == 0:
+            continue
+        chunk = piece.iloc[:cut]
+        chunk.index = pd.RangeIndex(offset, offset + cut)
+        offset += cut
+        yield chunk
+    
+    if carry is not None and carry.shape[0] > 0:
+        carry.index = pd.RangeIndex(offset, offset + carry.shape[0])
+        yield carry
+
+# %% ../00_core.ipynb 24
+_NS_PER_HOUR = 3600 * 10**9
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+
+def _wall_clock_ns(logtimes:pd.Series) -> np.ndarray:
+    """
+    Returns local wall clock times of a datetime series as int64 nanoseconds, dropping any time zone.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(logtimes):
+        raise TypeError("'{}' column must be converted to datetime object".format(logtimes.name))
+    if getattr(logtimes.dtype, 'tz', None) is not None:
+        logtimes = logtimes.dt.tz_localize(None)
+    return logtimes.to_numpy(dtype = 'datetime64[ns]').view('i8')
+
+def _as_datetime64_dates(dates:pd.Series) -> pd.Series:
+    """
+    Returns a date column as datetime64 values, converting datetime.date objects or date strings if needed.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(pd.Series(dates)).dt.normalize()
+
+def _shifted_day_ordinals(wall_ns:np.ndarray, h:int) -> np.ndarray:
+    """
+    Days since 1970-01-01 of each wall clock time, after shifting the start of the day by 'h' hours.
+    """
+    return (wall_ns - h * _NS_PER_HOUR) // _NS_PER_DAY
+
+def _float_hours(wall_ns:np.ndarray, h:int) -> np.ndarray:
+    """
+    Time of day in hours, wrapped so that it runs from 'h' (inclusive) to 24 + 'h' (exclusive).
+    """
+    # whole seconds and microseconds are kept apart to round exactly like Timedelta.total_seconds()
+    us = (wall_ns % _NS_PER_DAY) // 1000
+    local_time = ((us // 10**6) + (us % 10**6) / 1e6) / 3600.
+    if h > 0:
+        return np.where(local_time < h, 24 + local_time, local_time)
+    if h < 0:
+        return np.where(local_time > (24 + h), local_time-24., local_time)
+    return local_time
+
+# %% ../00_core.ipynb 25
 def find_date(data_source:str|pd.DataFrame,
               h:int = 4,
               date_col:int = 5) -> pd.Series:
@@ -107,25 +382,15 @@ def find_date(data_source:str|pd.DataFrame,
     Returns
     -------
     date
-        Series of dates in ISO 8601 format.
+        Series of dates as datetime64 values at midnight.
     """
     df = file_loader(data_source)
     # fifth column of food log dataframes should represent date/time in a 24 hour system
     col = df.columns[date_col]
-    if df[col].dtype == 'O':
-        raise TypeError("'{}' column must be converted to datetime object".format(col))
-        
-    def find_date(d, h):
-        if h > 0:
-            if d.hour < h:
-                return d.date() - pd.Timedelta('1 day')
-        if h < 0:
-            if d.hour+1 > (24+h):
-                return d.date() + pd.Timedelta('1 day')
-        return d.date()
-    return df[col].apply(find_date, args=([h]))
-
-# %% ../00_core.ipynb 20
+    days = _shifted_day_ordinals(_wall_clock_ns(df[col]), h)
+    return pd.Series(days.astype('datetime64[D]'), index = df.index, name = col)
+
+# %% ../00_core.ipynb 32
 def find_float_time(data_source:str|pd.DataFrame,
                     h:int = 4,
                     date_col:int = 5) -> pd.Series:
@@ -157,20 +422,11 @@ def find_float_time(data_source:str|pd.DataFrame,
     df = file_loader(data_source)
     # fifth column of food log dataframes should represent date/time in a 24 hour system
     col = df.columns[date_col]
-    if df[col].dtype == 'O':
-        raise TypeError("'{}' column must be converted to datetime object firsly".format(col))
-    local_time = df[col].apply(lambda x: pd.Timedelta(x.time().isoformat()).total_seconds() / 3600.)
-    if h > 0:
-        local_time = np.where(local_time < h, 24 + local_time, local_time)
-        # index= to prevent mistaken assignments when data source and target df have a non-trivial index
-        return pd.Series(local_time, index=df.index) 
-    if h < 0:
-        local_time = np.where(local_time > (24 + h), local_time-24., local_time)
-        return pd.Series(local_time, index=df.index)
-    return local_time
-    
+    local_time = _float_hours(_wall_clock_ns(df[col]), h)
+    # index= to prevent mistaken assignments when data source and target df have a non-trivial index
+    return pd.Series(local_time, index = df.index, name = None if h else col)
 
-# %% ../00_core.ipynb 28
+# %% ../00_core.ipynb 40
 def week_from_start(data_source:str|pd.DataFrame,
                     identifier:int = 1) -> np.array:
     """
@@ -202,14 +458,11 @@ def week_from_start(data_source:str|pd.DataFrame,
     identifier = df.columns[identifier]
     
     # Handle week from start
-    df_dic = dict(df.groupby(identifier)[col].agg(np.min))
+    days = pd.Series(pd.to_datetime(df[col]).to_numpy(dtype = 'datetime64[D]').view('i8'), index = df.index)
+    first_day = days.groupby(df[identifier]).transform('min')
+    return (days - first_day) // 7 + 1
 
-    def count_weeks(s):
-        return (s.date - df_dic[s[identifier]]).days // 7 + 1
-
-    return df.apply(count_weeks, axis = 1)
-
-# %% ../00_core.ipynb 32
+# %% ../00_core.ipynb 44
 def find_phase_duration(df:pd.DataFrame) -> pd.DataFrame:
     """
     Calculates the duration (in days) of the study phase for each row.
@@ -240,11 +493,122 @@ def find_phase_duration(df:pd.DataFrame) -> pd.DataFrame:
     df['phase_duration'] = df[end_day] - df[start_day] + pd.Timedelta("1 days")
     return df
 
-# %% ../00_core.ipynb 34
+# %% ../00_core.ipynb 46
+def parse_logtimes(logtimes:pd.Series,
+                   report:bool = False) -> pd.Series:
+    """
+    Parses raw log time strings into timestamps. Trailing a.m./p.m. markers are stripped and the date and time
+    tokens are converted in a single batch; only the rows the batch cannot read are parsed one at a time.
+    
+    Parameters
+    ----------
+    logtimes
+        Series of log time strings, such as the 'original_logtime' column of mCC exports.
+    report
+        If True, prints how many rows were parsed in the batch, by the per-row fallback, and not at all.
+    
+    
+    Returns
+    -------
+    parsed
+        Series of timestamps with the same index as logtimes. Rows that could not be parsed are missing.
+    """
+    def handle_time(s):
+        """
+        helper function to get rid of am/pm in the end of each time string
+        """
+        tmp_s = s.replace('p.m.', '').replace('a.m.', '')
+        try:
+            return pd.to_datetime(' '.join(tmp_s.split()[:2]) )
+        except:
+            try:
+                if int(tmp_s.split()[1][:2]) > 12:
+                    tmp_s = s.replace('p.m.', '').replace('a.m.', '').replace('PM', '').replace('pm', '')
+                return pd.to_datetime(' '.join(tmp_s.split()[:2]) )
+            except:
+                return np.nan
+    
+    # keep only the date and time tokens, as handle_time does row by row
+    candidates = logtimes.astype(str).str.replace('p.m.', '', regex = False).str.replace('a.m.', '', regex = False)
+    candidates = candidates.str.split(n = 2).str[:2].str.join(' ')
+    try:
+        parsed = pd.to_datetime(candidates, format = 'ISO8601', errors = 'coerce')
+    except ValueError:
+        # mixed time zone offsets cannot share a single column, so every row takes the slow path
+        parsed = pd.Series(pd.NaT, index = logtimes.index)
+    
+    failed = parsed.isna()
+    if failed.any():
+        values = parsed.astype(object)
+        values[failed] = logtimes[failed].map(handle_time, na_action = 'ignore')
+        # rebuild from scalars so the result has the same dtype as parsing each row separately
+        parsed = pd.Series(values.tolist(), index = logtimes.index)
+    
+    if report:
+        n_missing = parsed.isna().sum()
+        print(' => parse_logtimes()')
+        print('  => # of rows parsed in batch:', len(logtimes) - failed.sum())
+        print('  => # of rows parsed by the fallback:', failed.sum() - n_missing)
+        print('  => # of rows that could not be parsed:', n_missing)
+    
+    return parsed
+
+# %% ../00_core.ipynb 48
+def derive_time_features(data_source:str|pd.DataFrame,
+                         h:int = 4,
+                         identifier:int = 1,
+                         datetime_col:int = 5) -> pd.DataFrame:
+    """
+    Derives the date, float time, time, week from start, and year of each log in a single vectorized pass
+    over the nanosecond timestamps of a datetime column. Results match find_date, find_float_time and
+    week_from_start called separately with the same 'h'.
+    
+    Parameters
+    ----------
+    data_source
+        String file or folder path. Single .json or .csv paths create a pd.DataFrame. 
+        Folder paths with files matching the input pattern are read together into a single pd.DataFrame. Existing
+        dataframes are read as is.
+    h
+        Number of hours to shift the definition of 'date' by. h = 4 would indicate that a log date begins at
+        4:00 AM and ends the following calendar day at 3:59:59 AM.
+    identifier
+        Column number for an existing unique identifier column in provided data source. Data exported from mCC typically
+        has a unique identifier as its 1st column (with indexing starting from 0).
+    datetime_col
+        Column number for an existing datetime column in provided data source. Data exported from mCC typically
+        has datetime as its 5th column (with indexing starting from 0).
+    
+    
+    Returns
+    -------
+    features
+        Dataframe with date, float_time, time, week_from_start and year columns, indexed like the data source.
+        Dates are datetime64 values at midnight and times are timedelta64 offsets from midnight.
+    """
+    df = file_loader(data_source)
+    identifier = df.columns[identifier]
+    datetime_col = df.columns[datetime_col]
+    
+    wall_ns = _wall_clock_ns(df[datetime_col])
+    days = _shifted_day_ordinals(wall_ns, h)
+    first_day = pd.Series(days, index = df.index).groupby(df[identifier]).transform('min').to_numpy()
+    
+    features = pd.DataFrame(index = df.index)
+    features['date'] = days.astype('datetime64[D]')
+    features['float_time'] = _float_hours(wall_ns, h)
+    features['time'] = (wall_ns % _NS_PER_DAY).view('timedelta64[ns]')
+    features['week_from_start'] = (days - first_day) // 7 + 1
+    features['year'] = days.astype('datetime64[D]').astype('datetime64[Y]').astype('int64') + 1970
+    return features
+
+# %% ../00_core.ipynb 51
 def load_food_data(data_source:str|pd.DataFrame,
                    h:int,
                    identifier:int = 1,
-                   datetime_col:int = 5) -> pd.DataFrame:
+                   datetime_col:int = 5,
+                   cache_dir:str|None = None,
+                   report:bool = False) -> pd.DataFrame:
     """
     Loads and processes existing logging data, adding specific datetime information in formats
     more suitable for TREETS functions.
@@ -266,6 +630,13 @@ def load_food_data(data_source:str|pd.DataFrame,
     datetime_col
         Column number for an existing datetime column in provided data source. Data exported from mCC typically
         has datetime as its 5th column (with indexing starting from 0).
+    cache_dir
+        Folder for columnar (Feather) caches of the source files and of the processed result, which is reused
+        for as long as none of the matched source files change. Only applies when data_source is a path.
+        Defaults to the 'TREETS_CACHE_DIR' environment variable, if set. Requires pyarrow.
+    report
+        If True, prints how many log times were parsed in batch and how many needed the slower per-row parser.
+        Results read from the cache were not parsed again, so only a short note saying so is printed for them.
     
     
     Returns
@@ -273,7 +644,22 @@ def load_food_data(data_source:str|pd.DataFrame,
     food_data
         Dataframe with additional date, float time, and week from start columns.
     """
-    food_data = file_loader(data_source)
+    cache_dir = _resolve_cache_dir(cache_dir)
+    if isinstance(data_source, str) and cache_dir is not None:
+        sources = [x for x in sorted(glob.glob(data_source)) if x[-4:] == '.csv' or x[-5:] == '.json']
+        signature = {'sources': [_source_signature(x) for x in sources], 'versions': _cache_versions(), 'h': h,
+                     'identifier': identifier, 'datetime_col': datetime_col}
+        cache_file = _cache_file(cache_dir, ['load_food_data', os.path.abspath(data_source), h, identifier, datetime_col])
+        cached = _read_cache(cache_file, signature)
+        if cached is not None:
+            if report:
+                print(' => load_food_data()')
+                print('  => # of rows loaded from the cache (log times not parsed again):', cached.shape[0])
+            return cached
+    else:
+        cache_file = None
+    
+    food_data = file_loader(data_source, cache_dir = cache_dir)
     # identifier column(s) should be 0 and 1, with 1 being the study specific identifier
     identifier = food_data.columns[identifier]
     # fifth column of food log dataframes should represent date/time in a 24 hour system
@@ -284,45 +670,250 @@ def load_food_data(data_source:str|pd.DataFrame,
     except KeyError:
         pass
     
-    def handle_time(s):
-        """
-        helper function to get rid of am/pm in the end of each time string
-        """
-        tmp_s = s.replace('p.m.', '').replace('a.m.', '')
-        try:
-            return pd.to_datetime(' '.join(tmp_s.split()[:2]) )
-        except:
-            try:
-                if int(tmp_s.split()[1][:2]) > 12:
-                    tmp_s = s.replace('p.m.', '').replace('a.m.', '').replace('PM', '').replace('pm', '')
-                return pd.to_datetime(' '.join(tmp_s.split()[:2]) )
-            except:
-                return np.nan
-
-    food_data[datetime_col] = food_data[datetime_col].apply(handle_time)
+    food_data[datetime_col] = parse_logtimes(food_data[datetime_col], report = report)
     food_data = food_data.dropna().reset_index(drop = True)
-    food_data['date'] = find_date(food_data, h)
+    # date, float time, time, week from start and year in a single pass over the timestamps
+    features = derive_time_features(food_data, h, food_data.columns.get_loc(identifier), food_data.columns.get_loc(datetime_col))
+    for col in features.columns:
+        food_data[col] = features[col]
     
-    # Handle the time - Time in floating point format
-    food_data['float_time'] = find_float_time(food_data, h)
+    if cache_file is not None:
+        _write_cache(food_data, cache_file, signature)
     
-    # Handle the time - Time in Datetime object format
-    food_data['time'] = pd.DatetimeIndex(food_data[datetime_col]).time
+    return food_data
+
+# %% ../00_core.ipynb 53
+def to_legacy_dates(data_source:str|pd.DataFrame,
+                    date_cols:list = ['date'],
+                    time_cols:list = ['time']) -> pd.DataFrame:
+    """
+    Converts datetime64 date columns to datetime.date objects and timedelta64 time columns to datetime.time
+    objects, as produced by earlier versions of TREETS. Only needed for code that relies on those object types.
     
-    # Handle week from start
-    food_data['week_from_start'] = week_from_start(food_data)
+    Parameters
+    ----------
+    data_source
+        String file or folder path. Single .json or .csv paths create a pd.DataFrame. 
+        Folder paths with files matching the input pattern are read together into a single pd.DataFrame. Existing
+        dataframes are read as is.
+    date_cols
+        Names of date columns to convert. Missing columns are skipped.
+    time_cols
+        Names of time of day columns to convert. Missing columns are skipped.
     
-    food_data['year'] = food_data.date.apply(lambda d: d.year)
     
-    return food_data
+    Returns
+    -------
+    df
+        Copy of the data with converted date and time columns.
+    """
+    df = file_loader(data_source).copy()
+    for col in date_cols:
+        if col in df.columns:
+            df[col] = _as_datetime64_dates(df[col]).dt.date
+    for col in time_cols:
+        if col in df.columns and pd.api.types.is_timedelta64_dtype(df[col]):
+            df[col] = (pd.Timestamp(0) + df[col]).dt.time
+    return df
 
-# %% ../00_core.ipynb 36
+# %% ../00_core.ipynb 57
+def iter_load_food_data(data_source:str|pd.DataFrame,
+                        h:int,
+                        chunksize:int|None = None,
+                        identifier:int = 1,
+                        datetime_col:int = 5,
+                        cache_dir:str|None = None):
+    """
+    Iterator version of load_food_data that processes participant-aligned chunks from iter_file_loader
+    one at a time, keeping peak memory bounded by the chunk size rather than the size of the whole data source.
+    
+    Parameters
+    ----------
+    data_source
+        String file or folder path. Single .json or .csv paths create a pd.DataFrame. 
+        Folder paths with files matching the input pattern are read together into a single pd.DataFrame. Existing
+        dataframes are read as is.
+    h
+        Number of hours to shift the definition of 'date' by. h = 4 would indicate that a log date begins at
+        4:00 AM and ends the following calendar day at 3:59:59 AM.
+    chunksize
+        Approximate number of rows per chunk. By default each file is its own chunk.
+    identifier
+        Column number for an existing unique identifier column in provided data source. Data exported from mCC typically
+        has a unique identifier as its 1st column (with indexing starting from 0).
+    datetime_col
+        Column number for an existing datetime column in provided data source. Data exported from mCC typically
+        has datetime as its 5th column (with indexing starting from 0).
+    cache_dir
+        Folder for a columnar cache of whole files, see file_loader.
+    
+    
+    Yields
+    -------
+    food_data
+        Dataframe with additional date, float time, and week from start columns for one or more complete participants.
+    """
+    for chunk in iter_file_loader(data_source, chunksize, identifier, cache_dir):
+        yield load_food_data(chunk, h, identifier, datetime_col)
+
+# %% ../00_core.ipynb 59
+def _log_days(groups:np.ndarray,
+              days:np.ndarray,
+              times:np.ndarray = None,
+              caloric:np.ndarray = None) -> tuple[np.ndarray, pd.DataFrame]:
+    """
+    Aggregates logs by group (participant or phase) and day in one pass. 'groups' and 'days' hold sorted integer codes
+    of each log's group and date, -1 leaving a log out. Logs are sorted once by group, day and time, with missing times
+    last, so each day's first, last, median and distinct times are read off its sorted segment, skipping missing times.
+    Returns the day row of each log (-1 for logs left out) and one row per (group, day) with the 'group' and 'day'
+    codes, the number of logs and their first and last times, and the number of caloric logs and the first, last,
+    number of distinct and median times of these.
+    """
+    groups = np.asarray(groups, dtype = 'int64')
+    days = np.asarray(days, dtype = 'int64')
+    times = np.full(len(groups), np.nan) if times is None else np.asarray(times, dtype = float)
+    caloric = np.zeros(len(groups), dtype = bool) if caloric is None else np.asarray(caloric, dtype = bool)
+    
+    kept = np.flatnonzero((groups >= 0) & (days >= 0))
+    order = kept[np.lexsort((times[kept], days[kept], groups[kept]))]
+    g, d, t = groups[order], days[order], times[order]
+    new_day = np.ones(len(order), dtype = bool)
+    new_day[1:] = (g[1:] != g[:-1]) | (d[1:] != d[:-1])
+    day_of = np.cumsum(new_day) - 1
+    n_days = int(new_day.sum())
+    log_day = np.full(len(groups), -1, dtype = 'int64')
+    log_day[order] = day_of
+    
+    def segment_stats(day, t):
+        # number, first, last, distinct and median of the times in each day's segment, missing times at its end
+        valid = ~np.isnan(t)
+        changed = np.ones(len(t), dtype = bool)
+        changed[1:] = (day[1:] != day[:-1]) | (t[1:] != t[:-1])
+        count = np.bincount(day[valid], minlength = n_days)
+        start = np.searchsorted(day, np.arange(n_days))
+        # days without a time index the trailing NaN, or their neighbours, and are blanked out below
+        t = np.append(t, np.nan)
+        has_times = count > 0
+        first = np.where(has_times, t[start], np.nan)
+        last = np.where(has_times, t[start + count - 1], np.nan)
+        midpoint = np.where(has_times, (t[start + (count - 1) // 2] + t[start + count // 2]) / 2, np.nan)
+        return first, last, np.bincount(day[valid & changed], minlength = n_days), midpoint
+    
+    first_log, last_log, _, _ = segment_stats(day_of, t)
+    cal = caloric[order]
+    first_cal, last_cal, cal_occasions, cal_midpoint = segment_stats(day_of[cal], t[cal])
+    table = pd.DataFrame({'group': g[new_day], 'day': d[new_day],
+                          'log_count': np.bincount(day_of, minlength = n_days),
+                          'first_log': first_log, 'last_log': last_log,
+                          'cal_count': np.bincount(day_of[cal], minlength = n_days),
+                          'first_cal': first_cal, 'last_cal': last_cal,
+                          'cal_occasions': cal_occasions, 'cal_midpoint': cal_midpoint})
+    return log_day, table
+
+class DayTable:
+    """
+    Per participant and log date aggregates of food logging data. The logs are grouped once, and daily_metrics and the
+    summary and plotting functions that take a `day_table` reuse it instead of grouping the logs again. Every
+    (participant, date) with any log has a row with the number of logs and the first and last log times, and the number
+    of logs, first and last time, number of distinct times and median time of its caloric (food and beverage) logs.
+    Missing times are skipped.
+    """
+
+    def __init__(self,
+                 data_source:str|pd.DataFrame,
+                 identifier:int = 1,
+                 date_col:int = 6,
+                 time_col:int = 7):
+        """
+        Builds the day table of food logging data. It is recommended that you use find_date and find_float_time to
+        generate necessary date and time columns.
+        
+        Parameters
+        ----------
+        data_source
+            String file or folder path. Single .json or .csv paths create a pd.DataFrame. 
+            Folder paths with files matching the input pattern are read together into a single pd.DataFrame. Existing
+            dataframes are read as is. Caloric columns need a 'food_type' column, and are empty without one.
+        identifier
+            Column number for an existing unique identifier column in provided data source. Data exported from mCC
+            typically has a unique identifier as its 1st column (with indexing starting from 0).
+        date_col
+            Column number for an existing date column in provided data source. 
+        time_col
+            Column number for an existing time column in provided data source. 
+        """
+        df = file_loader(data_source)
+        identifier = df.columns[identifier]
+        
+        # if treets functions have been used (in any order) to generate columns
+        # find appropriate column names, if not check for expected column position
+        if 'date' in df.columns:
+            date_col = df.columns[df.columns.get_loc('date')]
+        else:
+            date_col = df.columns[date_col]
+            
+        if 'float_time' in df.columns:
+            time_col = df.columns[df.columns.get_loc('float_time')]
+        else:
+            time_col = df.columns[time_col]
+        
+        # the logs the table was built from and their resolved column names
+        self.data = df
+        self.identifier = identifier
+        self.date_col = date_col
+        self.time_col = time_col
+        
+        groups, participants = pd.factorize(df[identifier], sort = True)
+        dates, unique_dates = pd.factorize(df[date_col], sort = True)
+        caloric = df['food_type'].isin(['f','b']) if 'food_type' in df.columns else None
+        # row of each log's day in the table, -1 for logs without a participant or date
+        self.log_day, days = _log_days(groups, dates, df[time_col], caloric)
+        days.insert(0, identifier, participants.take(days.pop('group')))
+        days.insert(1, date_col, unique_dates.take(days.pop('day')))
+        self.days = days
+        # every participant in the logs, in the order of daily_metrics rows
+        self.participants = participants
+    
+    def good_logging(self,
+                     min_log_num:int = 2,
+                     min_separation:int = 5,
+                     caloric:bool = False) -> np.ndarray:
+        """
+        Flags 'good' logging days, which have at least min_log_num logs with at least min_separation hours between the
+        first and last log. If caloric is True, only caloric logs are counted.
+        """
+        if caloric:
+            count, first, last = self.days['cal_count'], self.days['first_cal'], self.days['last_cal']
+        else:
+            count, first, last = self.days['log_count'], self.days['first_log'], self.days['last_log']
+        return ((count >= min_log_num) & (last - first >= min_separation)).to_numpy()
+    
+    def caloric_series(self,
+                       column:str,
+                       min_log_num:int = None,
+                       min_separation:int = None) -> pd.Series:
+        """
+        One caloric column of the table (such as 'first_cal' or 'last_cal') for the days with caloric logs, or only
+        for caloric 'good' logging days if min_log_num and min_separation are given. The series is indexed by
+        participant and date and named after the time column, as when grouping the caloric logs.
+        """
+        if min_log_num is None:
+            days = self.days[self.days['cal_count'] > 0]
+        else:
+            days = self.days[self.good_logging(min_log_num, min_separation, caloric = True)]
+        return days.set_index([self.identifier, self.date_col])[column].rename(self.time_col)
+    
+    def __repr__(self):
+        return "{}({} participants, {} days)".format(type(self).__name__, self.days[self.identifier].nunique(), len(self.days))
+
+# %% ../00_core.ipynb 60
 def in_good_logging_day(data_source:str|pd.DataFrame,
                         min_log_num:int = 2,
                         min_separation:int = 5,
                         identifier:int = 1,
                         date_col:int = 6,
-                        time_col:int = 7) -> np.array:
+                        time_col:int = 7,
+                        day_table:DayTable = None) -> np.array:
     """
     Calculates if each log is considered to be within a 'good logging day'. A log day is considered 'good' if there 
     are at least the minimum number of required logs, with a minimum specified hour separation between the first and last
@@ -352,36 +943,217 @@ def in_good_logging_day(data_source:str|pd.DataFrame,
     time_col
         Column number for an existing time column in provided data source. 
     
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
+    
     
     Returns
     -------
     in_good_logging_day
         Boolean array describing whether each log is a 'good' logging day.
     """
-    def adherent(s):
-        return len(s.values) >= min_log_num and (max(s.values) - min(s.values)) >= min_separation
-        
-    df = file_loader(data_source)
-    identifier = df.columns[identifier]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
     
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
+    # each log takes the flag of its (participant, date) row, logs without a participant or date are not flagged
+    good = day_table.good_logging(min_log_num, min_separation)
+    return np.append(good, False)[day_table.log_day]
+
+# %% ../00_core.ipynb 62
+def good_logging_day_table(data_source:str|pd.DataFrame,
+                           min_log_num:int = 2,
+                           min_separation:int = 5,
+                           identifier:int = 1,
+                           date_col:int = 6,
+                           time_col:int = 7,
+                           day_table:DayTable = None) -> pd.DataFrame:
+    """
+    Summarizes each participant's log days and whether they are 'good' logging days, using the same criteria
+    as in_good_logging_day. It is recommended that you use find_date and find_float_time to generate necessary
+    date and time columns for this function.
     
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-        
-    adherent_dict = dict(df.groupby([identifier, date_col])[time_col].agg(adherent))
+    Parameters
+    ----------
+    data_source
+        String file or folder path. Single .json or .csv paths create a pd.DataFrame. 
+        Folder paths with files matching the input pattern are read together into a single pd.DataFrame. Existing
+        dataframes are read as is.
+    
+    min_log_num
+        Minimum number of logs required for a day to be considered a 'good' logging day.
+    
+    min_separation
+        Minimum number of hours between first and last log on a log day for it to be considered a 'good' logging day.
+    
+    identifier
+        Column number for an existing unique identifier column in provided data source. Data exported from mCC typically
+        has a unique identifier as its 1st column (with indexing starting from 0).
+
+    date_col
+        Column number for an existing date column in provided data source. 
+    
+    time_col
+        Column number for an existing time column in provided data source. 
+    
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
+    
+    
+    Returns
+    -------
+    day_table
+        Dataframe with one row per participant and log date, containing the number of logs, the first and last
+        log times, and a boolean 'good_logging' column.
+    """
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    
+    days = day_table.days[[day_table.identifier, day_table.date_col, 'log_count', 'first_log', 'last_log']].copy()
+    days['good_logging'] = day_table.good_logging(min_log_num, min_separation)
+    return days
 
-    return df.apply(lambda x: adherent_dict[(x[identifier], x.date)], axis = 1)
+# %% ../00_core.ipynb 65
+# NLTK resources used by FoodParser and their paths within an nltk_data directory
+_NLTK_RESOURCES = {"stopwords": "corpora/stopwords", "wordnet": "corpora/wordnet", "punkt_tab": "tokenizers/punkt_tab"}
 
-# %% ../00_core.ipynb 38
+def download_nlp_resources(download_dir:str = None):
+    """
+    Downloads the NLTK resources used by FoodParser (stop words, WordNet and the punkt tokenizer tables).
+    This is the only function that needs network access; parsers load resources without downloading.
+    Run it once after installing TREETS. Resources that are already available are not downloaded again.
+    
+    Parameters
+    ----------
+    download_dir
+        nltk_data directory to download into. Defaults to FoodParser.nltk_data_path.
+    """
+    import nltk
+    
+    if download_dir is None:
+        download_dir = FoodParser.nltk_data_path
+    search_paths = [os.path.abspath(download_dir)] + nltk.data.path
+    for resource, resource_path in _NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource_path, paths = search_paths)
+        except LookupError:
+            if not nltk.download(resource, download_dir = download_dir, quiet = True):
+                raise Exception("Could not download NLTK resource '{}'.".format(resource))
+
+@functools.cache
+def _load_nlp_resources(nltk_data_path:str):
+    """
+    Imports nltk with `nltk_data_path` searched first, and checks that the resources used by FoodParser
+    are available there or in NLTK's default data directories. Runs once per process and path.
+    """
+    import nltk
+    
+    nltk_data_path = os.path.abspath(nltk_data_path)
+    if nltk_data_path not in nltk.data.path:
+        nltk.data.path.insert(0, nltk_data_path)
+    for resource, resource_path in _NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            raise LookupError("NLTK resource '{}' was not found in '{}' or NLTK's data directories. "
+                              "Run download_nlp_resources() once to fetch it.".format(resource, nltk_data_path)) from None
+    return nltk
+
+@functools.cache
+def _wordsegment():
+    """Loads the wordsegment corpus on first use and returns the module."""
+    wordsegment.load()
+    return wordsegment
+
+# %% ../00_core.ipynb 66
+# precompiled patterns and tables for FoodParser.normalize_tokens
+_PUNCTUATION_TABLE = str.maketrans(string.punctuation, " " * len(string.punctuation))
+# drops punctuation and ascii digits together, for entries without numbered items
+_PUNCTUATION_DIGIT_TABLE = str.maketrans(string.punctuation, " " * len(string.punctuation), "0123456789")
+_NUMBERED_ITEMS = ("v8", "h2", "ag1", "co2", "0z")
+_LONE_NUMBER = re.compile(r"(?<![a-zA-Z])\d+(?![a-zA-Z])")
+_FRONT_MIXED = re.compile(r"\d+[^\sxX]+")
+_LEADING_NUMBER = re.compile(r"\d+")
+_TIMES_X = re.compile(r"[xX]\s*?\d")
+
+# column-wise counterparts for FoodParser.batch_normalize, keeping the commas that separate items
+_PUNCTUATION_PATTERN = "[" + re.escape(string.punctuation.replace(",", "")) + "]"
+
+# cleaned text made only of these characters is tokenized by whitespace instead of nltk.word_tokenize
+_PLAIN_TEXT = re.compile(r"[a-z0-9 ]*")
+# words nltk's Treebank tokenizer splits in two even without punctuation
+_TREEBANK_SPLITS = {"cannot": ["can", "not"], "gimme": ["gim", "me"], "gonna": ["gon", "na"],
+                    "gotta": ["got", "ta"], "lemme": ["lem", "me"], "wanna": ["wan", "na"]}
+_TREEBANK_SPLIT_WORDS = re.compile(r"\b(?:" + "|".join(_TREEBANK_SPLITS) + r")\b")
+
+# %% ../00_core.ipynb 67
+class _TagMatrixView(collections.abc.Mapping):
+    """
+    Read-only mapping of gram keys to their list of tags, backed by a gram ID table, an
+    integer tag matrix with one row per gram ID and the vocabulary of tag strings.
+    """
+    __slots__ = ("gram_ids", "tag_matrix", "tag_vocab")
+
+    def __init__(self, gram_ids, tag_matrix, tag_vocab):
+        self.gram_ids = gram_ids
+        self.tag_matrix = tag_matrix
+        self.tag_vocab = tag_vocab
+
+    def __getitem__(self, key):
+        return [self.tag_vocab[i] for i in self.tag_matrix[self.gram_ids[key]].tolist()]
+
+    def __iter__(self):
+        return iter(self.gram_ids)
+
+    def __len__(self):
+        return len(self.gram_ids)
+
+    def __repr__(self):
+        return "{}({} gram keys, {} tags)".format(type(self).__name__, len(self), len(self.tag_vocab))
+
+# %% ../00_core.ipynb 68
+class ParseResult:
+    """
+    Parse of a single food entry, built in one pass over its cleaned tokens. Spans are
+    (start, end) token index pairs into `tokens`, which holds the tokens of every comma
+    separated item of the entry in order.
+    """
+    __slots__ = ("tokens", "spans", "keys", "food_types", "unknown_spans")
+
+    def __init__(self, tokens, spans, keys, food_types, unknown_spans):
+        self.tokens = tokens
+        self.spans = spans
+        self.keys = keys
+        self.food_types = food_types
+        self.unknown_spans = unknown_spans
+
+    @property
+    def num_tokens(self):
+        return len(self.tokens)
+
+    @property
+    def num_unknown(self):
+        return sum(end - start for start, end in self.unknown_spans)
+
+    @property
+    def unknown_tokens(self):
+        """Runs of consecutive unknown tokens, joined by spaces."""
+        return [" ".join(self.tokens[start:end]) for start, end in self.unknown_spans]
+
+    def to_legacy(self, calc_unknowns = False):
+        """
+        Converts the result to the array returned by `FoodParser.parse_food`: the matched keys, or
+        [keys, number of tokens, number of unknown tokens, unknown tokens] if `calc_unknowns` is true.
+        """
+        if calc_unknowns:
+            return np.array(
+                [list(self.keys), self.num_tokens, self.num_unknown, self.unknown_tokens], dtype = "object"
+            )
+        return np.array(list(self.keys), dtype = "object")
+
+    def __repr__(self):
+        return "{}(keys={!r}, unknown_tokens={!r})".format(type(self).__name__, list(self.keys), self.unknown_tokens)
+
+# %% ../00_core.ipynb 69
 class FoodParser:
     """
     Food parser handles taking unprocessed food log entries and adding relevant
@@ -389,32 +1161,68 @@ class FoodParser:
     their likely matches, adding food type and other identifying information.
     """
 
-    def __init__(self):
-        """Initializes food parser object."""
-        # read in manually annotated file
-        parser_keys_df = pd.read_csv("data/12_08_2023_parser_keys.csv")
-        all_gram_set, food_type_dict, food2tags = self.process_parser_keys_df(
-            parser_keys_df
-        )
-        correction_dic = pd.read_json("data/correction_dic.json", typ="series")
-        
-        self.all_gram_set = all_gram_set
-        self.food_type_dict = food_type_dict
-        self._food_phrases = np.unique(
-            [
-                word
-                for key in self.food_type_dict
-                for word in key.split()
-                if self.food_type_dict[key] in ["f", "b", "m"] and len(word) > 2
-            ]
-        )
-        self.correction_dic = correction_dic
-        self.food2tags = food2tags
+    # source files of the parser dictionary, relative to the working directory
+    parser_keys_path = "data/12_08_2023_parser_keys.csv"
+    correction_dic_path = "data/correction_dic.json"
+    # searched before NLTK's default data directories, see download_nlp_resources()
+    nltk_data_path = "data/nltk_data"
+    # bump when the layout of the compiled dictionary changes to invalidate stored artifacts
+    compiled_version = 4
+    # compiled dictionaries already loaded in this process, keyed by source hash
+    _compiled_cache = {}
+    # token resolution tables already loaded in this process, keyed by source hash
+    _token_tables = {}
+
+    def __init__(self, cache_size:int = 10000, tokenizer = "fast"):
+        """
+        Initializes food parser object.
 
-        # Load common stop words and nlp type objects
-        self.wnl = WordNetLemmatizer()
+        Parameters
+        ----------
+        cache_size: int
+            Maximum number of normalized entries kept in the parse cache used by
+            `parse_food(..., dedupe=True)`. 0 disables the cache. Default is 10000.
+
+        tokenizer: str or callable
+            Tokenizer for cleaned entries. 'fast' (default) splits plain lowercase text on
+            whitespace and falls back to nltk.word_tokenize for anything else, giving the same
+            tokens; 'nltk' always uses nltk.word_tokenize. A callable taking a string and
+            returning a list of tokens can also be given (it must be picklable for `n_jobs`).
+        """
+        # compiled gram sets, food types, tags, phrases and corrections, shared between parsers
+        compiled = self.load_compiled_dictionary()
+        self.all_gram_set = compiled["all_gram_set"]
+        self.food_type_dict = compiled["food_type_dict"]
+        self._food_phrases = compiled["food_phrases"]
+        self.correction_dic = compiled["correction_dic"]
+        self._corrections = compiled["corrections"]
+        self.gram_ids = compiled["gram_ids"]
+        self._type_codes = compiled["type_codes"]
+        self._type_vocab = compiled["type_vocab"]
+        # read-only view of gram key -> tag list over the integer tag matrix
+        self.food2tags = _TagMatrixView(self.gram_ids, compiled["tag_matrix"], compiled["tag_vocab"])
+        self.gram_trie = compiled["gram_trie"]
+
+        # token -> resolved form and word -> lemma tables used by fix_spelling, shared between parsers
+        token_table = self.load_token_table()
+        self.token_table = token_table["tokens"]
+        self.lemma_table = token_table["lemmas"]
+
+        # Load common stop words and nlp type objects, importing nltk on first use
+        nltk = _load_nlp_resources(self.nltk_data_path)
+        self.wnl = nltk.stem.WordNetLemmatizer()
+        self._nltk_tokenize = nltk.word_tokenize
+        self.tokenizer = tokenizer
+        if tokenizer == "fast":
+            self.tokenize = self._fast_tokenize
+        elif tokenizer == "nltk":
+            self.tokenize = nltk.word_tokenize
+        elif callable(tokenizer):
+            self.tokenize = tokenizer
+        else:
+            raise ValueError("tokenizer must be 'fast', 'nltk' or a callable.")
 
-        self.stop_words = stopwords.words("english")
+        self.stop_words = nltk.corpus.stopwords.words("english")
         self.stop_words.remove("out")  # since pre work out is a valid beverage name
         self.stop_words.remove("no")
         self.stop_words.remove("not")
@@ -423,6 +1231,256 @@ class FoodParser:
         self.stop_words.remove("of")
         # preventing common vitamins from being removed
         self.stop_words.remove("d")
+        self._stop_word_set = frozenset(self.stop_words)
+
+        # least recently used parse results, keyed by normalized entry
+        self.cache_size = cache_size
+        self._parse_cache = collections.OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def compiled_dictionary_path(cls):
+        """Path of the compiled dictionary artifact, stored next to the parser keys.
+
+        Returns
+        -------
+        path: str
+            Pickle file path.
+        """
+        return os.path.splitext(cls.parser_keys_path)[0] + ".pkl"
+
+    @classmethod
+    def source_hash(cls):
+        """Hashes the parser keys and correction dictionary files together with the
+        compiled dictionary version.
+
+        Returns
+        -------
+        source_hash: str
+            Hex digest identifying the current dictionary sources.
+        """
+        source_hash = hashlib.sha256(str(cls.compiled_version).encode())
+        for path in [cls.parser_keys_path, cls.correction_dic_path]:
+            with open(path, "rb") as f:
+                source_hash.update(f.read())
+        return source_hash.hexdigest()
+
+    @classmethod
+    def compile_dictionary(cls):
+        """Builds the parser dictionary from the parser keys and correction dictionary files.
+
+        Returns
+        -------
+        compiled: dict
+            Dictionary with 'all_gram_set', 'food_type_dict', 'gram_ids', 'type_codes', 'type_vocab',
+            'tag_matrix', 'tag_vocab', 'food_phrases', 'correction_dic', 'corrections' and 'gram_trie' entries.
+        """
+        # read in manually annotated file
+        parser_keys_df = pd.read_csv(cls.parser_keys_path)
+        all_gram_set, food_type_dict, food2tags = cls.process_parser_keys_df(
+            parser_keys_df
+        )
+        food_phrases = frozenset(
+            word
+            for key in food_type_dict
+            for word in key.split()
+            if food_type_dict[key] in ["f", "b", "m"] and len(word) > 2
+        )
+        correction_dic = pd.read_json(cls.correction_dic_path, typ="series")
+
+        # gram keys get integer IDs in parser keys order, and their tags are stored as IDs into
+        # a vocabulary of tag strings (with "" for missing tags)
+        gram_ids = {key: i for i, key in enumerate(food2tags)}
+        tag_vocab = [""] + sorted({tag for tags in food2tags.values() for tag in tags} - {""})
+        tag_ids = {tag: i for i, tag in enumerate(tag_vocab)}
+        tag_matrix = np.array([[tag_ids[tag] for tag in tags] for tags in food2tags.values()],
+                              dtype=np.int16).reshape(len(gram_ids), -1)
+        # food types by gram ID, as codes into a vocabulary of food types
+        type_codes, type_vocab = pd.factorize(
+            np.array([food_type_dict[key] for key in gram_ids], dtype=object)
+        )
+        return {
+            "all_gram_set": all_gram_set,
+            "food_type_dict": food_type_dict,
+            "gram_ids": gram_ids,
+            "type_codes": type_codes.astype(np.int8),
+            "type_vocab": tuple(type_vocab),
+            "tag_matrix": tag_matrix,
+            "tag_vocab": tuple(tag_vocab),
+            "food_phrases": food_phrases,
+            "correction_dic": correction_dic,
+            "corrections": correction_dic.to_dict(),
+            "gram_trie": cls.build_gram_trie(all_gram_set),
+        }
+
+    @classmethod
+    def load_compiled_dictionary(cls):
+        """Loads the compiled parser dictionary. The pickle artifact next to the parser keys
+        is used when its source hash matches the current source files, otherwise the
+        dictionary is compiled and the artifact is (re)written. Loaded dictionaries are kept
+        for the rest of the process, so parsers share them and should not modify them.
+
+        Returns
+        -------
+        compiled: dict
+            Dictionary with 'all_gram_set', 'food_type_dict', 'gram_ids', 'tag_matrix', 'tag_vocab',
+            'food_phrases', 'correction_dic', 'corrections' and 'gram_trie' entries.
+        """
+        source_hash = cls.source_hash()
+        if source_hash in cls._compiled_cache:
+            return cls._compiled_cache[source_hash]
+
+        artifact = cls.compiled_dictionary_path()
+        compiled = None
+        try:
+            with open(artifact, "rb") as f:
+                stored = pickle.load(f)
+            if stored["source_hash"] == source_hash:
+                compiled = stored["dictionary"]
+        except Exception:
+            # the artifact is only a cache, anything unreadable (e.g. pickled by other pandas or numpy
+            # versions) is recompiled
+            pass
+
+        if compiled is None:
+            compiled = cls.compile_dictionary()
+            # write to a per process temporary file first so readers never see a partial artifact
+            # and processes compiling at the same time do not overwrite each other's file
+            tmp_file = "{}.{}.tmp".format(artifact, os.getpid())
+            try:
+                with open(tmp_file, "wb") as f:
+                    pickle.dump({"source_hash": source_hash, "dictionary": compiled}, f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_file, artifact)
+            except OSError:
+                pass
+
+        cls._compiled_cache[source_hash] = compiled
+        return compiled
+
+    @classmethod
+    def token_table_path(cls):
+        """Path of the token resolution table, stored next to the parser keys.
+
+        Returns
+        -------
+        path: str
+            Pickle file path.
+        """
+        return os.path.splitext(cls.parser_keys_path)[0] + "_tokens.pkl"
+
+    @classmethod
+    def load_token_table(cls):
+        """Loads the token resolution table used by `fix_spelling`. The stored table is used
+        when its source hash matches the current source files, otherwise an empty table is
+        started. Tables are kept for the rest of the process and filled lazily by every parser.
+
+        Returns
+        -------
+        table: dict
+            Dictionary with 'tokens' (token -> resolved form) and 'lemmas' (word -> lemma)
+            entries, and the 'saved_size' of both at the last load or save.
+        """
+        source_hash = cls.source_hash()
+        if source_hash in cls._token_tables:
+            return cls._token_tables[source_hash]
+
+        table = {"tokens": {}, "lemmas": {}}
+        try:
+            with open(cls.token_table_path(), "rb") as f:
+                stored = pickle.load(f)
+            if stored["source_hash"] == source_hash:
+                table = {"tokens": stored["tokens"], "lemmas": stored["lemmas"]}
+        except Exception:
+            # like the compiled dictionary, an unreadable table is only a cache miss
+            pass
+        table["saved_size"] = len(table["tokens"]) + len(table["lemmas"])
+
+        cls._token_tables[source_hash] = table
+        return table
+
+    @classmethod
+    def save_token_table(cls):
+        """Writes the token resolution table next to the parser keys if it has grown since it
+        was last loaded or saved.
+        """
+        source_hash = cls.source_hash()
+        table = cls.load_token_table()
+        size = len(table["tokens"]) + len(table["lemmas"])
+        if size == table["saved_size"]:
+            return
+
+        path = cls.token_table_path()
+        # write to a per process temporary file first so readers never see a partial table
+        # and concurrent clean_loggings processes do not overwrite each other's file
+        tmp_file = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump({"source_hash": source_hash, "tokens": table["tokens"], "lemmas": table["lemmas"]}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, path)
+        except OSError:
+            return
+        table["saved_size"] = size
+
+    def precompute_token_table(self, entries=None):
+        """Resolves tokens ahead of time and saves the token resolution table.
+
+        Parameters
+        ----------
+        entries: list or series of str, optional
+            Food entries whose cleaned tokens are resolved. By default the words of the parser
+            keys and correction dictionary are resolved.
+        """
+        words = set()
+        if entries is None:
+            for phrase in itertools.chain(self.food_type_dict, self.correction_dic.index):
+                words.update(phrase.split())
+        else:
+            for entry in pd.unique(np.asarray(entries, dtype=object)):
+                for piece in entry.split(","):
+                    words.update(self.normalize_tokens(piece))
+        for word in words:
+            self.resolve_token(word)
+        self.save_token_table()
+
+    @staticmethod
+    def build_gram_trie(all_gram_set):
+        """Builds a token-ID trie over all grams, where a node's depth is its gram length.
+
+        Parameters
+        ----------
+        all_gram_set: list
+            Sets of known grams, indexed by gram length - 1.
+
+        Returns
+        -------
+        token_ids: dict
+            Maps each token appearing in a gram to an integer ID.
+        edges: dict
+            Maps (node, token ID) pairs to child nodes. The root is node 0.
+        terminal: list of bool
+            Whether each node ends a known gram.
+        """
+        token_ids = {}
+        edges = {}
+        terminal = [False]
+        for gram_length, gram_set in enumerate(all_gram_set, 1):
+            for gram in gram_set:
+                words = gram.split(" ")
+                # grams that cannot be rebuilt from gram_length tokens never matched before either
+                if len(words) != gram_length:
+                    continue
+                node = 0
+                for word in words:
+                    token_id = token_ids.setdefault(word, len(token_ids))
+                    if (node, token_id) not in edges:
+                        edges[(node, token_id)] = len(terminal)
+                        terminal.append(False)
+                    node = edges[(node, token_id)]
+                terminal[node] = True
+        return token_ids, edges, terminal
 
     @staticmethod
     def process_parser_keys_df(parser_keys_df):
@@ -561,7 +1619,7 @@ class FoodParser:
         text: str
             Text with stop words removed.
         """
-        return " ".join([word for word in text.split() if word not in self.stop_words])
+        return " ".join([word for word in text.split() if word not in self._stop_word_set])
 
     def pre_processing(self, text):
         """
@@ -663,10 +1721,159 @@ class FoodParser:
             sent = self.handle_x2(sent, times_x_tokens)
         return sent
 
+    def normalize_tokens(self, text):
+        """
+        Fused equivalent of `clean_format(pre_processing(text)).split()`. Punctuation is dropped with a
+        translation table, then numbers, stop words and front mixed amounts are handled token by token
+        in a single pass with precompiled patterns. 'Times x' tokens can span words (e.g. 'max 2'
+        becomes 'ma x2'), so those rare entries fall back to `handle_x2` on the joined text.
+
+        Parameters
+        ----------
+        text: str
+            Text to be cleaned.
+
+        Returns
+        -------
+        tokens: list of str
+            Cleaned tokens, identical to the step by step methods.
+        """
+        text = text.lower()
+        # numbered items (e.g. v8, co2) keep digits next to letters, otherwise ascii digits go with the
+        # punctuation; decimals need a '.', so they never survive dropping punctuation
+        if any(sub in text for sub in _NUMBERED_ITEMS):
+            text = text.translate(_PUNCTUATION_TABLE)
+            words = [_LONE_NUMBER.sub("", word) for word in text.split()]
+        else:
+            text = text.translate(_PUNCTUATION_DIGIT_TABLE)
+            words = text.split()
+        tokens = [word for word in words if word and word not in self._stop_word_set]
+
+        # removing digits never creates a front mixed token, so the whole text is checked first
+        if _FRONT_MIXED.search(text):
+            split_tokens = []
+            for word in tokens:
+                if _FRONT_MIXED.fullmatch(word):
+                    number = _LEADING_NUMBER.match(word).group()
+                    split_tokens += word.replace(number, number + " ").split()
+                else:
+                    split_tokens.append(word)
+            tokens = split_tokens
+
+        if "x" in text:
+            sent = " ".join(tokens)
+            times_x_tokens = _TIMES_X.findall(sent)
+            if len(times_x_tokens) != 0:
+                tokens = self.handle_x2(sent, times_x_tokens).split()
+        return tokens
+
+    def batch_normalize(self, series):
+        """
+        Column-wise pre-processing of food entries with vectorized string kernels. Entries are
+        lowercased, punctuation other than the commas separating items becomes whitespace, ascii
+        digits are dropped from entries without numbered items (e.g. v8, co2) and whitespace is
+        collapsed. Parsing a normalized entry gives the same result as parsing the original, and
+        entries differing only in case, punctuation or spacing normalize to the same text.
+
+        Parameters
+        ----------
+        series: list or series of str
+            Food entries to be normalized.
+
+        Returns
+        -------
+        normalized: pd.Series
+            Normalized entries, aligned with the input.
+        """
+        series = pd.Series(series, dtype = "str")
+        normalized = series.str.lower()
+        # vectorized lowercasing differs from str.lower for a few non-ascii characters
+        non_ascii = series.str.contains(r"[^\x00-\x7f]", regex = True)
+        if non_ascii.any():
+            normalized[non_ascii] = series[non_ascii].map(str.lower, na_action = "ignore")
+
+        normalized = normalized.str.replace(_PUNCTUATION_PATTERN, " ", regex = True)
+        numbered = normalized.str.contains("|".join(_NUMBERED_ITEMS), regex = True)
+        if not numbered.all():
+            normalized = normalized.where(numbered, normalized.str.replace("[0-9]", "", regex = True))
+
+        normalized = normalized.str.replace(r"\s+", " ", regex = True)
+        return normalized.str.replace(" ,", ",", regex = False).str.replace(", ", ",", regex = False).str.strip()
+
     ########## Handle Typos ##########
 
+    def lemmatize(self, word):
+        """Lemmatizes a word, remembering the result in the lemma table.
+
+        Parameters
+        ----------
+        word: str
+            Word (or phrase) to be lemmatized.
+
+        Returns
+        -------
+        lemma: str
+            WordNet lemma of the word.
+        """
+        lemma = self.lemma_table.get(word)
+        if lemma is None:
+            lemma = self.wnl.lemmatize(word)
+            self.lemma_table[word] = lemma
+        return lemma
+
+    def resolve_token(self, token):
+        """Resolves a single token of an entry to its corrected form, filling the token
+        table on first sight of the token.
+
+        Parameters
+        ----------
+        token: str
+            Token to be corrected.
+
+        Returns
+        -------
+        token: str
+            Lemmatized, dictionary corrected or segmented form of the token.
+        """
+        resolved = self.token_table.get(token)
+        if resolved is None:
+            resolved = self._resolve_token(token)
+            self.token_table[token] = resolved
+        return resolved
+
+    def _resolve_token(self, token):
+        """Resolves a single token without consulting the token table."""
+        # try lemmatized version of the token
+        lem_token = self.lemmatize(token)
+        if (lem_token in self._food_phrases) or (lem_token in self.food_type_dict):
+            token = lem_token
+        # try looking for token in correction dictionary
+        elif token in self._corrections:
+            token = " ".join(
+                [self.lemmatize(i) for i in self._corrections[token].split()]
+            )
+        # check if token is incorrectly joined
+        # (e.g. blueberrymuffin instead of blueberry muffin)
+        elif token not in self._food_phrases:
+            temp = []
+            token_alt = _wordsegment().segment(token)
+            for word in token_alt:
+                if self.lemmatize(word) in self._food_phrases:
+                    temp += [word]
+                # check if split word needs spell correction
+                elif (
+                    word in self._corrections
+                    and self._corrections[word] in self._food_phrases
+                ):
+                    temp += [self._corrections[word]]
+            # if there are any newly corrected/unjoined tokens add them back to the result
+            if len(temp) > 1:
+                token = " ".join([self.lemmatize(i) for i in temp])
+        return token.strip()
+
     def fix_spelling(self, entry):
-        """Corrects spelling mistakes.
+        """Corrects spelling mistakes. Tokens are resolved through the token table, so
+        lemmatization and word segmentation only run for tokens not seen before.
 
         Parameters
         ----------
@@ -678,48 +1885,20 @@ class FoodParser:
         entry: str
             Original entry with spelling corrections applied.
         """
-        result = []
-
         # if entry is recognized keep it
         if entry in self.food_type_dict:
             return entry
         # try looking for entry in correction dictionary
-        if entry in self.correction_dic:
+        if entry in self._corrections:
             return " ".join(
-                [self.wnl.lemmatize(i) for i in self.correction_dic[entry].split()]
+                [self.lemmatize(i) for i in self._corrections[entry].split()]
             )
         # try lemmatized version of whole entry
-        if self.wnl.lemmatize(entry) in self.food_type_dict:
-            return self.wnl.lemmatize(entry)
+        lem_entry = self.lemmatize(entry)
+        if lem_entry in self.food_type_dict:
+            return lem_entry
         # try correcting individual tokens within entry phrase
-        for token in entry.split():
-            # try lemmatized version of the token
-            lem_token = self.wnl.lemmatize(token)
-            if (lem_token in self._food_phrases) or (lem_token in self.food_type_dict):
-                token = lem_token
-            # try looking for token in correction dictionary
-            elif token in self.correction_dic:
-                token = " ".join(
-                    [self.wnl.lemmatize(i) for i in self.correction_dic[token].split()]
-                )
-            # check if token is incorrectly joined
-            # (e.g. blueberrymuffin instead of blueberry muffin)
-            elif token not in self._food_phrases:
-                temp = []
-                token_alt = wordsegment.segment(token)
-                for word in token_alt:
-                    if self.wnl.lemmatize(word) in self._food_phrases:
-                        temp += [word]
-                    # check if split word needs spell correction
-                    elif (
-                        word in self.correction_dic
-                        and self.correction_dic[word] in self._food_phrases
-                    ):
-                        temp += [self.correction_dic[word]]
-                # if there are any newly corrected/unjoined tokens add them back to the result
-                if len(temp) > 1:
-                    token = " ".join([self.wnl.lemmatize(i) for i in temp])
-            result.append(token.strip())
+        result = [self.resolve_token(token) for token in entry.split()]
         return " ".join(result).strip()
 
     def handle_all_cleaning(self, entry):
@@ -737,8 +1916,7 @@ class FoodParser:
             String entry with all forms of pre-processing and cleaning
             applied.
         """
-        entry = self.pre_processing(entry)
-        entry = self.clean_format(entry)
+        entry = " ".join(self.normalize_tokens(entry))
         entry = self.fix_spelling(entry)
         entry = re.sub("\s\s+", " ", entry)
         return entry
@@ -788,6 +1966,102 @@ class FoodParser:
                 food_lst.append(curr_word)
         return food_lst
 
+    def match_grams(self, tokens):
+        """
+        Finds the known grams in a token sequence. Every match is collected with one walk of the
+        gram trie from each token, then matches are accepted longest first and left to right
+        within a length, skipping any that overlap an accepted gram (as `parse_single_gram`
+        does for lengths 5 to 1).
+
+        Parameters
+        ----------
+        tokens: list of str
+            Tokens of a cleaned entry.
+
+        Returns
+        -------
+        food_lst: list
+            Accepted grams, in order of acceptance.
+        coverage: bytearray
+            Length of the accepted gram covering each token, 0 for unknown tokens.
+        """
+        token_ids, edges, terminal = self.gram_trie
+        ids = [token_ids.get(token, -1) for token in tokens]
+        n = len(ids)
+
+        # start positions of matches for each gram length, in increasing order
+        matches = [[] for _ in self.all_gram_set]
+        for i in range(n):
+            node = 0
+            for j in range(i, min(i + len(matches), n)):
+                node = edges.get((node, ids[j]))
+                if node is None:
+                    break
+                if terminal[node]:
+                    matches[j - i].append(i)
+
+        food_lst = []
+        coverage = bytearray(n)
+        for gram_length in range(len(matches), 0, -1):
+            for i in matches[gram_length - 1]:
+                if not any(coverage[i : i + gram_length]):
+                    coverage[i : i + gram_length] = bytes([gram_length]) * gram_length
+                    food_lst.append(" ".join(tokens[i : i + gram_length]))
+        return food_lst, coverage
+
+    def _fast_tokenize(self, text):
+        """
+        Tokenizes cleaned text like nltk.word_tokenize. Plain lowercase text cannot hold the
+        punctuation nltk splits on, so it is split on whitespace (and the few words the Treebank
+        tokenizer always splits); any other text is passed to nltk.word_tokenize.
+        """
+        if not _PLAIN_TEXT.fullmatch(text):
+            return self._nltk_tokenize(text)
+        tokens = text.split()
+        if _TREEBANK_SPLIT_WORDS.search(text):
+            tokens = [t for token in tokens for t in _TREEBANK_SPLITS.get(token, [token])]
+        return tokens
+
+    def validate_tokenizer(self, entries):
+        """
+        Checks the parser's tokenizer against nltk.word_tokenize on the cleaned items of a corpus.
+
+        Parameters
+        ----------
+        entries: list or series of str
+            Food entries to clean and tokenize.
+
+        Returns
+        -------
+        mismatches: pd.DataFrame
+            One row per cleaned item where the tokens differ, with columns 'cleaned', 'tokens'
+            and 'nltk_tokens'. Empty when the tokenizer agrees with nltk on the whole corpus.
+        """
+        cleaned = pd.unique(pd.Series([self.handle_all_cleaning(piece) for entry in pd.unique(np.asarray(entries, dtype = object))
+                                       for piece in entry.split(",")], dtype = object))
+        rows = [(text, self.tokenize(text), self._nltk_tokenize(text)) for text in cleaned]
+        return pd.DataFrame([row for row in rows if row[1] != row[2]], columns = ['cleaned', 'tokens', 'nltk_tokens'])
+
+    def _parse_tokens(self, entry):
+        """
+        Cleans and tokenizes a single entry and matches its grams.
+
+        Returns
+        -------
+        all_food: list
+            Matched grams.
+        tokens: list of str
+            Tokens of the cleaned entry.
+        coverage: bytearray
+            Length of the gram covering each token, 0 for unknown tokens.
+        """
+        cleaned = self.handle_all_cleaning(entry)
+
+        # Create tokens and match grams of length 5 or under
+        tokens = self.tokenize(cleaned)
+        all_food, coverage = self.match_grams(tokens)
+        return all_food, tokens, coverage
+
     def parse_single_entry(self, entry, return_sentence_tag=False):
         """
         Handles pre-processing, cleaning, and gram processing for a single entry.
@@ -801,35 +2075,63 @@ class FoodParser:
         -------
         All grams of length 5 or under for the particular entry.
         """
-        cleaned = self.handle_all_cleaning(entry)
+        all_food, tokens, coverage = self._parse_tokens(entry)
 
-        # Create tokens and n-grams
-        tokens = nltk.word_tokenize(cleaned)
-        bigram = list(nltk.ngrams(tokens, 2)) if len(tokens) > 1 else None
-        trigram = list(nltk.ngrams(tokens, 3)) if len(tokens) > 2 else None
-        quadgram = list(nltk.ngrams(tokens, 4)) if len(tokens) > 3 else None
-        pentagram = list(nltk.ngrams(tokens, 5)) if len(tokens) > 4 else None
-        all_gram_lst = [tokens, bigram, trigram, quadgram, pentagram]
-
-        # Create an array of tags
-        sentence_tag = np.array(["Unknown"] * len(tokens))
-
-        all_food = []
-        for gram_length in [5, 4, 3, 2, 1]:
-            if len(tokens) < gram_length:
-                continue
-            tmp_food_lst = self.parse_single_gram(
-                gram_length,
-                self.all_gram_set[gram_length - 1],
-                all_gram_lst[gram_length - 1],
-                sentence_tag,
-            )
-            all_food += tmp_food_lst
         if return_sentence_tag:
+            # Create an array of tags, "Unknown" or the length of the gram covering each token
+            sentence_tag = np.array(["Unknown"] * len(tokens))
+            for i, gram_length in enumerate(coverage):
+                if gram_length:
+                    sentence_tag[i] = str(gram_length)
             return all_food, sentence_tag
         return all_food
 
-    def parse_food(self, series, calc_unknowns = False):
+    def parse_entry(self, entry):
+        """
+        Parses a single food entry into a `ParseResult`, cleaning and tokenizing each comma
+        separated item once.
+
+        Parameters
+        ----------
+        entry: str
+            Food entry to be parsed.
+
+        Returns
+        -------
+        ParseResult with the tokens of the entry, the matched keys with their token spans and
+        food types, and the spans of runs of unknown tokens.
+        """
+        tokens = []
+        spans = []
+        keys = []
+        unknown_spans = []
+        for word in entry.split(","):
+            all_food, word_tokens, coverage = self._parse_tokens(word)
+            offset = len(tokens)
+            tokens += word_tokens
+            keys += all_food
+
+            # accepted grams are the coverage runs of their length, matched back in acceptance order
+            key_spans = {}
+            i = 0
+            while i < len(coverage):
+                gram_length = coverage[i]
+                if gram_length:
+                    key_spans.setdefault(" ".join(word_tokens[i : i + gram_length]), []).append(offset + i)
+                    i += gram_length
+                else:
+                    start = i
+                    while i < len(coverage) and not coverage[i]:
+                        i += 1
+                    unknown_spans.append((offset + start, offset + i))
+            for food in all_food:
+                start = key_spans[food].pop(0)
+                spans.append((start, start + len(food.split(" "))))
+
+        return ParseResult(tuple(tokens), tuple(spans), tuple(keys),
+                           tuple(self.find_food_type(food) for food in keys), tuple(unknown_spans))
+
+    def parse_food(self, series, calc_unknowns = False, dedupe = False, n_jobs = 1, structured = False):
         """
         Parses a series of single food entries.
 
@@ -840,16 +2142,220 @@ class FoodParser:
         
         calc_unknowns: bool
             If true, includes unknown token information in return. Default is false.
+
+        dedupe: bool
+            If true, distinct entries are normalized with `batch_normalize` and each distinct
+            normalized entry is parsed only once (through the parse cache), with the result
+            broadcast back to every row holding it. Rows with the same entry then share the
+            same result object. Default is false.
+
+        n_jobs: int
+            Number of worker processes used to parse entries (or distinct entries when deduplicating).
+            -1 uses all available cores. Results are returned in input order. Default is 1.
+
+        structured: bool
+            If true, returns the `ParseResult` of each entry instead of arrays of parsed items, and
+            `calc_unknowns` is ignored since the results carry the unknown tokens. Default is false.
             
         Returns
         -------
-        Series of parsed food items.
+        Series of parsed food items, or of `ParseResult` if `structured` is true.
         """
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+
+        if dedupe:
+            codes, parsed = self._parse_distinct(series, n_jobs)
+            if not structured:
+                for i, result in enumerate(parsed):
+                    parsed[i] = result.to_legacy(calc_unknowns)
+            return parsed[codes]
+
+        if n_jobs > 1:
+            results = self._parallel_parse_entries(list(series), n_jobs)
+            parsed = np.empty(len(results), dtype = object)
+            for i, x in enumerate(results):
+                parsed[i] = x if structured else x.to_legacy(calc_unknowns)
+            return parsed
+
+        if structured:
+            parsed = np.empty(len(series), dtype = object)
+            for i, x in enumerate(series):
+                parsed[i] = self.parse_entry(x)
+            return parsed
+
         def parse(x, calc_unknowns = calc_unknowns):
             return self._parse_food(x, calc_unknowns)
         vec = np.vectorize(parse)
         return vec(series)
 
+    def _parse_distinct(self, series, n_jobs = 1):
+        """
+        Parses each distinct entry of a series once, through the parse cache.
+
+        Returns
+        -------
+        codes: np.ndarray
+            Index of each row's entry into `parsed`.
+        parsed: np.ndarray
+            `ParseResult` of each distinct normalized entry.
+        """
+        codes, uniques = pd.factorize(np.asarray(series, dtype = object), use_na_sentinel = False)
+        # normalize the distinct entries column-wise, merging those that only differ in case,
+        # punctuation or spacing before any per-entry work
+        normalized_codes, uniques = pd.factorize(self.batch_normalize(uniques).to_numpy(dtype = object),
+                                                 use_na_sentinel = False)
+        codes = normalized_codes[codes]
+        counts = np.bincount(codes, minlength = len(uniques))
+        precomputed = None
+        if n_jobs > 1:
+            # parse the distinct entries missing from the cache in parallel, then fill it in order
+            todo = list(dict.fromkeys(x for x in (self._normalize_entry(y) for y in uniques)
+                                      if x not in self._parse_cache))
+            precomputed = dict(zip(todo, self._parallel_parse_entries(todo, n_jobs)))
+        parsed = np.empty(len(uniques), dtype = object)
+        for i, (entry, count) in enumerate(zip(uniques, counts)):
+            parsed[i] = self._cached_parse_entry(entry, int(count), precomputed)
+        return codes, parsed
+
+    def parsed_items(self, series, n_jobs = 1):
+        """
+        Parses a series of food entries into a long table with one row per parsed item.
+
+        Each distinct entry is parsed once (as with `parse_food(..., dedupe=True)`), and rows are
+        expanded with array operations. Gram keys, food types and tags are categorical columns, so
+        the table is compact in memory and is written to Parquet as dictionary encoded columns
+        (`df.to_parquet(path)`, which requires pyarrow or fastparquet).
+
+        Parameters
+        ----------
+        series: list or series of str
+            Food entries to be parsed.
+
+        n_jobs: int
+            Number of worker processes used to parse distinct entries. -1 uses all available cores.
+            Default is 1.
+
+        Returns
+        -------
+        items: pd.DataFrame
+            Columns 'row_id' (position of the entry in `series`), 'item_idx' (position of the item
+            within the entry), 'gram_key', 'food_type' and one column per tag ('tag1', 'tag2', ...),
+            with missing tags as NaN.
+        """
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+        codes, parsed = self._parse_distinct(series, n_jobs)
+
+        # gram IDs of the items of each distinct entry, concatenated
+        distinct_ids = [[self.gram_ids[key] for key in result.keys] for result in parsed]
+        lengths = np.array([len(ids) for ids in distinct_ids], dtype = np.int64)
+        starts = np.cumsum(lengths) - lengths
+        flat_ids = np.fromiter(itertools.chain.from_iterable(distinct_ids), dtype = np.int64, count = lengths.sum())
+
+        # expand to one row per item of every row
+        row_lengths = lengths[codes]
+        row_id = np.repeat(np.arange(len(codes)), row_lengths)
+        row_starts = np.cumsum(row_lengths) - row_lengths
+        item_idx = np.arange(len(row_id)) - np.repeat(row_starts, row_lengths)
+        gram_ids = flat_ids[np.repeat(starts[codes], row_lengths) + item_idx]
+
+        items = pd.DataFrame({
+            'row_id': row_id,
+            'item_idx': item_idx,
+            'gram_key': pd.Categorical.from_codes(gram_ids, categories = list(self.gram_ids)),
+            'food_type': pd.Categorical.from_codes(self._type_codes[gram_ids], categories = self._type_vocab),
+        })
+        # tag ID 0 is the missing tag
+        tag_ids = self.food2tags.tag_matrix[gram_ids]
+        tag_categories = list(self.food2tags.tag_vocab[1:])
+        for i in range(tag_ids.shape[1]):
+            items['tag' + str(i + 1)] = pd.Categorical.from_codes(tag_ids[:, i].astype(np.int64) - 1,
+                                                                 categories = tag_categories)
+        return items
+
+    @staticmethod
+    def _normalize_entry(entry):
+        """
+        Normalizes an entry to lowercase with collapsed whitespace, which does not change the
+        parse since cleaning lowercases and re-splits the text anyway.
+        """
+        return " ".join(entry.lower().split())
+
+    def _cached_parse_entry(self, entry, count = 1, precomputed = None):
+        """
+        Parses a single food entry into a `ParseResult` through the LRU parse cache.
+
+        `count` is the number of rows served by this lookup and is added to the hit/miss counters.
+        `precomputed` optionally maps normalized entries to results already parsed elsewhere.
+        """
+        key = self._normalize_entry(entry)
+        if key in self._parse_cache:
+            self._parse_cache.move_to_end(key)
+            self.cache_hits += count
+            return self._parse_cache[key]
+
+        self.cache_misses += 1
+        self.cache_hits += count - 1
+        if precomputed is not None and key in precomputed:
+            result = precomputed[key]
+        else:
+            result = self.parse_entry(key)
+        if self.cache_size > 0:
+            self._parse_cache[key] = result
+            if len(self._parse_cache) > self.cache_size:
+                self._parse_cache.popitem(last = False)
+        return result
+
+    def _parallel_parse_entries(self, entries, n_jobs = 2):
+        """
+        Parses a list of entries into `ParseResult` on a process pool, returning results in input order.
+
+        A short sample is parsed in this process first to estimate the cost per entry. Chunks are
+        sized to take about `_PARSE_CHUNK_SECONDS` each so pickling and scheduling overhead stays
+        small, without leaving any worker idle. Work that fits in a single chunk is not sent to a pool.
+        """
+        start = time.perf_counter()
+        results = [self.parse_entry(x) for x in entries[:_PARSE_SAMPLE_SIZE]]
+        per_entry = (time.perf_counter() - start) / max(len(results), 1)
+        rest = entries[len(results):]
+
+        chunksize = max(int(np.ceil(_PARSE_CHUNK_SECONDS / max(per_entry, 1e-9))), 1)
+        if len(rest) <= chunksize:
+            return results + [self.parse_entry(x) for x in rest]
+        chunksize = min(chunksize, int(np.ceil(len(rest) / n_jobs)))
+        chunks = [rest[i:i + chunksize] for i in range(0, len(rest), chunksize)]
+
+        # each worker builds its own parser once; map returns chunks in submission order
+        with concurrent.futures.ProcessPoolExecutor(max_workers = min(n_jobs, len(chunks)),
+                                                    initializer = _init_parse_worker,
+                                                    initargs = (self.tokenizer,)) as pool:
+            for chunk in pool.map(_parse_entry_chunk, chunks):
+                results += chunk
+        return results
+
+    def parse_cache_info(self) -> dict:
+        """
+        Reports how effective the parse cache has been for this parser.
+
+        Returns
+        -------
+        Dictionary with the number of rows served from cache (`hits`), rows that had to be
+        parsed (`misses`), the resulting `hit_rate`, and the current and maximum cache size.
+        """
+        total = self.cache_hits + self.cache_misses
+        return {'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / total if total else 0.0,
+                'size': len(self._parse_cache),
+                'maxsize': self.cache_size}
+
+    def clear_parse_cache(self):
+        """Empties the parse cache and resets its hit/miss counters."""
+        self._parse_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def _parse_food(self, entry, calc_unknowns = False):
         """
         Parses a single food entry.
@@ -866,39 +2372,7 @@ class FoodParser:
         -------
         A single parsed food entry.
         """
-        result = []
-        unknown_tokens = []
-        num_unknown = 0
-        num_token = 0
-
-        for word in entry.split(","):
-            # previous versions of this if statement assume that
-            # return_sentence_tag is True and will actually break
-            # if the default parameters are used
-            all_food, sentence_tag = self.parse_single_entry(word, True)
-            result += all_food
-            if calc_unknowns:
-                if sentence_tag is not None and len(sentence_tag) > 0:
-                    num_unknown += sum(np.array(sentence_tag) == "Unknown")
-                    num_token += len(sentence_tag)
-                    cleaned = nltk.word_tokenize(self.handle_all_cleaning(word))
-
-                    # Return uncaught tokens, grouped into sub-sections
-                    tmp_unknown = ""
-                    for i, tag in enumerate(sentence_tag):
-                        if tag == "Unknown":
-                            tmp_unknown += " " + cleaned[i]
-                            if i == len(sentence_tag) - 1:
-                                unknown_tokens.append(tmp_unknown.strip())
-                        elif tmp_unknown != "":
-                            unknown_tokens.append(tmp_unknown.strip())
-                            tmp_unknown = ""
-        if calc_unknowns:
-            return np.array(
-                [result, num_token, num_unknown, unknown_tokens], dtype = "object"
-            )
-            
-        return np.array(result, dtype = "object")
+        return self.parse_entry(entry).to_legacy(calc_unknowns)
 
     def find_food_type(self, food):
         """
@@ -919,6 +2393,49 @@ class FoodParser:
         # shorthand for unknown
         return "u"
 
+    def annotate(self, keys, sparse = False):
+        """
+        Finds the food types and tags of many gram keys at once, joining the keys against the
+        compiled dictionary as a single categorical lookup instead of one dictionary lookup per key.
+
+        Parameters
+        ----------
+        keys: list, array or series of str
+            Gram keys to annotate, such as the 'gram_key' column of `parsed_items`. Categorical
+            input is recoded without looking at each value.
+
+        sparse: bool
+            If true, tags are returned as a sparse indicator matrix instead of a matrix of tag IDs.
+            Requires scipy. Default is false.
+
+        Returns
+        -------
+        food_types: pd.Categorical
+            Food type of each key, 'u' for keys not in the dictionary (as `find_food_type`).
+        tags: np.ndarray or scipy.sparse.csr_matrix
+            If not sparse, an integer matrix with a row of tag IDs into `food2tags.tag_vocab` per key
+            (0 for a missing tag, and a row of 0 for unknown keys). If sparse, a boolean matrix with a
+            row per key and a column per tag of `food2tags.tag_vocab[1:]`, true where the key has the tag.
+        """
+        gram_ids = pd.Categorical(keys, categories = list(self.gram_ids)).codes.astype(np.int64)
+        known = gram_ids >= 0
+
+        # unknown keys get the code after the last food type, mapped to 'u'
+        type_codes = np.where(known, self._type_codes[gram_ids], len(self._type_vocab))
+        food_types = pd.Categorical.from_codes(type_codes, categories = list(self._type_vocab) + ["u"])
+        tag_ids = np.where(known[:, None], self.food2tags.tag_matrix[gram_ids], 0)
+        if not sparse:
+            return food_types, tag_ids
+
+        import scipy.sparse
+
+        rows, cols = np.nonzero(tag_ids)
+        indicator = scipy.sparse.csr_matrix(
+            (np.ones(len(rows), dtype = bool), (rows, tag_ids[rows, cols] - 1)),
+            shape = (len(tag_ids), len(self.food2tags.tag_vocab) - 1)
+        )
+        return food_types, indicator
+
     ################# DataFrame Functions #################
     def expand_entries(self, df):
         """
@@ -945,10 +2462,29 @@ class FoodParser:
         df = df[~df["desc_text"].str.isdigit()]
         return df
 
+# %% ../00_core.ipynb 70
+# entries parsed in-process to estimate parse cost before chunking work for a process pool
+_PARSE_SAMPLE_SIZE = 32
+# target parse time per chunk sent to a worker, in seconds
+_PARSE_CHUNK_SECONDS = 0.25
+
+# parser built once per worker process by the pool initializer
+_worker_parser = None
+
+def _init_parse_worker(tokenizer = "fast"):
+    """Builds the FoodParser used by a parse_food worker process."""
+    global _worker_parser
+    _worker_parser = FoodParser(cache_size = 0, tokenizer = tokenizer)
 
-# %% ../00_core.ipynb 39
+def _parse_entry_chunk(entries):
+    """Parses a chunk of entries with the worker process' FoodParser."""
+    return [_worker_parser.parse_entry(x) for x in entries]
+
+# %% ../00_core.ipynb 86
 def clean_loggings(data_source:str|pd.DataFrame,
-                   identifier:int = 1) -> pd.DataFrame:
+                   identifier:int = 1,
+                   n_jobs:int = 1,
+                   long_format:bool = False) -> pd.DataFrame:
     """
     Cleans and attempts typo correction for all logging text entries.
     
@@ -961,12 +2497,18 @@ def clean_loggings(data_source:str|pd.DataFrame,
     identifier
         Column number for an existing unique identifier column in provided data source. Data exported from mCC typically
         has a unique identifier as its 1st column (with indexing starting from 0).
+    n_jobs
+        Number of worker processes used to parse distinct entries. -1 uses all available cores.
+    long_format
+        If true, returns one row per parsed item instead of a column of item lists (see `FoodParser.parsed_items`),
+        which can be filtered with column operations and written to Parquet.
     
     
     Returns
     -------
     df_parsed
-        Dataframe with an additional column containing cleaned and typo corrected item entries.
+        Dataframe with an additional column containing cleaned and typo corrected item entries. In long format,
+        the identifier column followed by the columns of `FoodParser.parsed_items`.
 
     """
 
@@ -977,8 +2519,16 @@ def clean_loggings(data_source:str|pd.DataFrame,
     # initialize food parser instance
     fp = FoodParser()
     
+    if long_format:
+        items = fp.parsed_items(df["desc_text"], n_jobs = n_jobs)
+        fp.save_token_table()
+        items.insert(0, identifier, df[identifier].to_numpy()[items['row_id'].to_numpy()])
+        return items
+
     # parse food
-    parsed = fp.parse_food(df["desc_text"])
+    parsed = fp.parse_food(df["desc_text"], dedupe = True, n_jobs = n_jobs)
+    # keep newly resolved tokens for later runs
+    fp.save_token_table()
     df_parsed = pd.DataFrame({
     identifier: df[identifier],
     text_col: df[text_col],
@@ -987,7 +2537,7 @@ def clean_loggings(data_source:str|pd.DataFrame,
     
     return df_parsed
 
-# %% ../00_core.ipynb 42
+# %% ../00_core.ipynb 89
 def get_types(data_source:str|pd.DataFrame,
               food_type:str|list) -> pd.DataFrame:
     """
@@ -1024,7 +2574,7 @@ def get_types(data_source:str|pd.DataFrame,
         
     return filtered
 
-# %% ../00_core.ipynb 47
+# %% ../00_core.ipynb 94
 def count_caloric_entries(df:pd.DataFrame) -> int:
     """
     Counts the number of food ('f') and beverage ('b') loggings.
@@ -1048,7 +2598,137 @@ def count_caloric_entries(df:pd.DataFrame) -> int:
     
     return num_caloric
 
-# %% ../00_core.ipynb 49
+# %% ../00_core.ipynb 96
+# metrics computed by daily_metrics, in column order
+_DAILY_METRICS = ['mean_daily_eating_duration', 'std_daily_eating_duration', 'mean_first_cal', 'std_first_cal',
+                  'mean_last_cal', 'std_last_cal', 'mean_daily_eating_occasions', 'std_daily_eating_occasions',
+                  'mean_daily_eating_midpoint', 'std_daily_eating_midpoint', 'earliest_entry', 'logging_day_counts']
+
+def _reduce_days(groups:np.ndarray,
+                 days:pd.DataFrame,
+                 n_groups:int) -> pd.DataFrame:
+    """
+    Averages a table of days (see _log_days and DayTable) by group, giving every daily metric but the earliest entry
+    for group codes 0 to n_groups - 1. 'groups' holds the group code of each day. Days without caloric logs only count
+    towards the logging day counts.
+    """
+    groups = np.asarray(groups, dtype = 'int64')
+    caloric = (days['cal_count'] > 0).to_numpy()
+    first, last = days['first_cal'].to_numpy()[caloric], days['last_cal'].to_numpy()[caloric]
+    daily = pd.DataFrame({'first': first, 'last': last, 'duration': last - first,
+                          'occasions': days['cal_occasions'].to_numpy()[caloric],
+                          'midpoint': days['cal_midpoint'].to_numpy()[caloric]}).groupby(groups[caloric])
+    
+    metrics = pd.DataFrame({'mean_daily_eating_duration': daily['duration'].mean(),
+                            'std_daily_eating_duration': daily['duration'].std(),
+                            'mean_first_cal': daily['first'].mean(),
+                            'std_first_cal': daily['first'].std(),
+                            'mean_last_cal': daily['last'].mean(),
+                            'std_last_cal': daily['last'].std(),
+                            'mean_daily_eating_occasions': daily['occasions'].mean(),
+                            'std_daily_eating_occasions': daily['occasions'].std(),
+                            'mean_daily_eating_midpoint': daily['midpoint'].mean(),
+                            'std_daily_eating_midpoint': daily['midpoint'].std()},
+                           index = pd.RangeIndex(n_groups), columns = _DAILY_METRICS[:10])
+    metrics['logging_day_counts'] = np.bincount(groups, minlength = n_groups)
+    return metrics
+
+def _earliest_caloric(groups:np.ndarray,
+                      n_groups:int,
+                      times:np.ndarray,
+                      caloric:np.ndarray) -> np.ndarray:
+    """
+    Earliest caloric entry of each group, whether or not it has a date. Logs with a group code of -1 are left out.
+    """
+    groups = np.asarray(groups, dtype = 'int64')
+    caloric = np.asarray(caloric, dtype = bool) & (groups >= 0)
+    earliest = np.full(n_groups, np.nan)
+    np.fmin.at(earliest, groups[caloric], np.asarray(times, dtype = float)[caloric])
+    return earliest
+
+def _daily_metrics_core(groups:np.ndarray,
+                        n_groups:int,
+                        dates:pd.Series = None,
+                        times:np.ndarray = None,
+                        food_types:pd.Series = None) -> pd.DataFrame:
+    """
+    Computes every daily metric for 'n_groups' groups of logs (participants or phases) in one pass. 'groups' holds
+    the group code of each log, from 0 to n_groups - 1 (or -1 to leave a log out). Logs are aggregated by day with
+    _log_days, as in DayTable, and the small per-day table is averaged by group. Missing dates, times or food types
+    leave the metrics needing them empty. Returns one row per group code with a column per metric.
+    """
+    n = len(groups)
+    days = np.full(n, -1) if dates is None else pd.factorize(pd.Series(dates), sort = True)[0]
+    times = np.full(n, np.nan) if times is None else np.asarray(times, dtype = float)
+    caloric = np.zeros(n, dtype = bool) if food_types is None else pd.Series(food_types).isin(['f','b']).to_numpy()
+    
+    _, day_table = _log_days(groups, days, times, caloric)
+    metrics = _reduce_days(day_table['group'], day_table, n_groups)
+    metrics.insert(10, 'earliest_entry', _earliest_caloric(groups, n_groups, times, caloric))
+    return metrics
+
+def _single_group_metric(df:pd.DataFrame,
+                         metric:str,
+                         date_col:int|str = None,
+                         time_col:int|str = None):
+    """
+    One daily metric of a dataframe holding a single participant's logs. Date and time columns are found by name
+    ('date', 'float_time') or else by position, and None leaves them out.
+    """
+    if date_col is not None:
+        date_col = df.columns[df.columns.get_loc('date')] if 'date' in df.columns else df.columns[date_col]
+    if time_col is not None:
+        time_col = df.columns[df.columns.get_loc('float_time')] if 'float_time' in df.columns else df.columns[time_col]
+    
+    metrics = _daily_metrics_core(np.zeros(len(df), dtype = 'int64'), 1,
+                                  None if date_col is None else df[date_col],
+                                  None if time_col is None else df[time_col],
+                                  None if time_col is None else df['food_type'])
+    return metrics[metric].iloc[0]
+
+def daily_metrics(df:pd.DataFrame,
+                  identifier:int = 1,
+                  date_col:int = 6,
+                  time_col:int = 7,
+                  day_table:DayTable = None) -> pd.DataFrame:
+    """
+    Calculates every daily eating metric (eating duration, first and last caloric entry, eating occasions and eating
+    midpoint averages and standard deviations, earliest entry and logging day counts) for every participant at once.
+    Each column matches the function of the same name applied to one participant's logs. It is recommended that you
+    use find_date and find_float_time to generate necessary date and time columns for this function.
+    
+    Parameters
+    ----------
+    df
+        Dataframe of food logging data. A column for 'food_type' must exist within the data.
+    identifier
+        Column number for an existing unique identifier column in provided data source.
+    date_col
+        Column number for an existing date column in provided data source. 
+    time_col
+        Column number for an existing time column in provided data source.
+    day_table
+        DayTable of df, whose days are averaged instead of grouping the logs again. df is not read when it is given.
+        
+        
+    Returns
+    -------
+    metrics
+        Dataframe with one row per participant, indexed by identifier, and one column per metric.
+    """
+    if day_table is None:
+        day_table = DayTable(df, identifier, date_col, time_col)
+    
+    participants = day_table.participants
+    data = day_table.data
+    metrics = _reduce_days(participants.get_indexer(day_table.days[day_table.identifier]), day_table.days, len(participants))
+    metrics.insert(10, 'earliest_entry', _earliest_caloric(participants.get_indexer(data[day_table.identifier]),
+                                                           len(participants), data[day_table.time_col],
+                                                           data['food_type'].isin(['f','b'])))
+    metrics.index = pd.Index(participants, name = day_table.identifier)
+    return metrics
+
+# %% ../00_core.ipynb 98
 def mean_daily_eating_duration(df:pd.DataFrame,
                                date_col:int = 6,
                                time_col:int = 7) -> float:
@@ -1073,22 +2753,9 @@ def mean_daily_eating_duration(df:pd.DataFrame,
     mean_daily_eating_duration
         Float representation of average daily eating window duration.
     """
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    return _single_group_metric(df, 'mean_daily_eating_duration', date_col, time_col)
 
-    df = df[df['food_type'].isin(['f','b'])]
-    breakfast_time = df.groupby(date_col)[time_col].agg(min)
-    dinner_time = df.groupby(date_col)[time_col].agg(max)
-    return (dinner_time - breakfast_time).mean()
-
-# %% ../00_core.ipynb 51
+# %% ../00_core.ipynb 100
 def std_daily_eating_duration(df:pd.DataFrame,
                               date_col:int = 6,
                               time_col:int = 7) -> float:
@@ -1113,23 +2780,9 @@ def std_daily_eating_duration(df:pd.DataFrame,
     std_daily_eating_duration
         Float representation of the standard deviation of daily eating window duration.
     """
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-        
-    df = df[df['food_type'].isin(['f','b'])]
-    breakfast_time = df.groupby(date_col)[time_col].agg(min)
-    dinner_time = df.groupby(date_col)[time_col].agg(max)
+    return _single_group_metric(df, 'std_daily_eating_duration', date_col, time_col)
 
-    return (dinner_time - breakfast_time).std()
-
-# %% ../00_core.ipynb 53
+# %% ../00_core.ipynb 102
 def earliest_entry(df:pd.DataFrame,
                    time_col:int = 7) -> float:
     """
@@ -1149,15 +2802,9 @@ def earliest_entry(df:pd.DataFrame,
     earliest_entry
         Float representation of the earliest logtime on any date.
     """
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-        
-    df = get_types(df, ['f', 'b'])
-    return df[time_col].min()
+    return _single_group_metric(df, 'earliest_entry', time_col = time_col)
 
-# %% ../00_core.ipynb 55
+# %% ../00_core.ipynb 104
 def mean_first_cal(df:pd.DataFrame,
                    date_col:int = 6,
                    time_col:int = 7) -> float:
@@ -1181,21 +2828,9 @@ def mean_first_cal(df:pd.DataFrame,
     mean_first_cal
         Float representation of average first caloric entry time. 
     """
-    
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-    
-    df = df[df['food_type'].isin(['f','b'])]
-    return df.groupby([date_col])[time_col].min().mean()
+    return _single_group_metric(df, 'mean_first_cal', date_col, time_col)
 
-# %% ../00_core.ipynb 58
+# %% ../00_core.ipynb 107
 def std_first_cal(df:pd.DataFrame,
                   date_col:int = 6,
                   time_col:int = 7) -> float:
@@ -1219,20 +2854,9 @@ def std_first_cal(df:pd.DataFrame,
     std_first_cal
         Float representation of the standard deviation of first caloric entry time. 
     """
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-        
-    df = df[df['food_type'].isin(['f','b'])]
-    return df.groupby([date_col])[time_col].min().std()
+    return _single_group_metric(df, 'std_first_cal', date_col, time_col)
 
-# %% ../00_core.ipynb 60
+# %% ../00_core.ipynb 109
 def mean_last_cal(df:pd.DataFrame,
                   date_col:int = 6,
                   time_col:int = 7) -> float:
@@ -1256,20 +2880,9 @@ def mean_last_cal(df:pd.DataFrame,
     mean_last_cal
         Float representation of average last caloric entry time.
     """
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[6]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[7]
-        
-    df = df[df['food_type'].isin(['f','b'])]
-    return df.groupby([date_col])[time_col].max().mean()
+    return _single_group_metric(df, 'mean_last_cal', date_col, time_col)
 
-# %% ../00_core.ipynb 62
+# %% ../00_core.ipynb 111
 def std_last_cal(df:pd.DataFrame,
                  date_col:int = 6,
                  time_col:int = 7) -> float:
@@ -1293,20 +2906,9 @@ def std_last_cal(df:pd.DataFrame,
     std_last_cal
         Float representation of the standard deviation of last caloric entry time. 
     """
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-        
-    df = df[df['food_type'].isin(['f','b'])]
-    return df.groupby([date_col])[time_col].max().std()
+    return _single_group_metric(df, 'std_last_cal', date_col, time_col)
 
-# %% ../00_core.ipynb 64
+# %% ../00_core.ipynb 113
 def mean_daily_eating_occasions(df: pd.DataFrame,
                                 date_col:int = 6,
                                 time_col:int = 7) -> int:
@@ -1330,21 +2932,9 @@ def mean_daily_eating_occasions(df: pd.DataFrame,
     mean_daily_eating_occasion
         Average number of daily eating occasions. 
     """
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-    
-    df = df[df['food_type'].isin(['f','b'])]
-    
-    return df.groupby([date_col])[time_col].nunique().mean()
+    return _single_group_metric(df, 'mean_daily_eating_occasions', date_col, time_col)
 
-# %% ../00_core.ipynb 66
+# %% ../00_core.ipynb 115
 def std_daily_eating_occasions(df: pd.DataFrame,
                                 date_col:int = 6,
                                 time_col:int = 7) -> int:
@@ -1368,21 +2958,9 @@ def std_daily_eating_occasions(df: pd.DataFrame,
     std_daily_eating_occasion
         Standard deviation of the number of daily eating occasions. 
     """
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-    
-    df = df[df['food_type'].isin(['f','b'])]
-    
-    return df.groupby([date_col])[time_col].nunique().std()
+    return _single_group_metric(df, 'std_daily_eating_occasions', date_col, time_col)
 
-# %% ../00_core.ipynb 68
+# %% ../00_core.ipynb 117
 def mean_daily_eating_midpoint(df: pd.DataFrame,
                                 date_col:int = 6,
                                 time_col:int = 7) -> int:
@@ -1405,22 +2983,10 @@ def mean_daily_eating_midpoint(df: pd.DataFrame,
     -------
     mean_daily_eating_midpoint
         Float representation of the average daily midpoint eating occasion time. 
-    """ 
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-    
-    df = df[df['food_type'].isin(['f','b'])]
-    
-    return df.groupby([date_col])[time_col].median().mean()
+    """
+    return _single_group_metric(df, 'mean_daily_eating_midpoint', date_col, time_col)
 
-# %% ../00_core.ipynb 70
+# %% ../00_core.ipynb 119
 def std_daily_eating_midpoint(df: pd.DataFrame,
                                 date_col:int = 6,
                                 time_col:int = 7) -> int:
@@ -1443,22 +3009,10 @@ def std_daily_eating_midpoint(df: pd.DataFrame,
     -------
     std_daily_eating_midpoint
         Float representation of the standard deviation of the daily midpoint eating occasion time. 
-    """ 
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-    
-    df = df[df['food_type'].isin(['f','b'])]
-    
-    return df.groupby([date_col])[time_col].median().std()
+    """
+    return _single_group_metric(df, 'std_daily_eating_midpoint', date_col, time_col)
 
-# %% ../00_core.ipynb 72
+# %% ../00_core.ipynb 121
 def logging_day_counts(df:pd.DataFrame) -> int:
     """
     Calculates the number of days that contain any logs. It is recommended that
@@ -1475,13 +3029,12 @@ def logging_day_counts(df:pd.DataFrame) -> int:
     logging_day_counts
         Number of days with at least one log on that day.
     """
-    date_col = df.columns[df.columns.get_loc('date')]
-    return df[date_col].nunique()
+    return _single_group_metric(df, 'logging_day_counts', date_col = df.columns.get_loc('date'))
 
-# %% ../00_core.ipynb 74
+# %% ../00_core.ipynb 123
 def find_missing_logging_days(df:pd.DataFrame,
-                              start_date:datetime.date = "not_defined",
-                              end_date:datetime.date = "not_defined") -> list:
+                              start_date:pd.Timestamp|datetime.date = "not_defined",
+                              end_date:pd.Timestamp|datetime.date = "not_defined") -> list:
     """
     Finds days that have no log entries between a start (inclusive) and end date (inclusive).
     It is recommended that you use find_date to generate the necessary date column for this
@@ -1500,7 +3053,7 @@ def find_missing_logging_days(df:pd.DataFrame,
     Returns
     -------
     missing_days
-        List of days within the given timeframe that have no log entries.
+        List of days (as pd.Timestamp at midnight) within the given timeframe that have no log entries.
     """
     
     # if start_date or end_date is missing, return nan
@@ -1508,21 +3061,192 @@ def find_missing_logging_days(df:pd.DataFrame,
     if pd.isnull(start_date) or pd.isnull(end_date):
         return np.nan
     
+    dates = _as_datetime64_dates(df['date'])
+    
     # if there is no input on start_date or end_date, use earliest date and latest date
     if start_date == "not_defined":
-        start_date = df['date'].min()
+        start_date = dates.min()
     if end_date == "not_defined":
-        end_date = df['date'].max()
+        end_date = dates.max()
+    
+    all_days = pd.date_range(pd.Timestamp(start_date), pd.Timestamp(end_date), freq = 'D')
+    return list(all_days[~all_days.isin(dates)])
+
+# %% ../00_core.ipynb 127
+def _tag_logs_with_phases(log_ids:pd.Series,
+                          log_dates:pd.Series,
+                          phase_ids:pd.Series,
+                          start_dates:pd.Series,
+                          end_dates:pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs each log with every phase of the same participant whose start and end dates cover the log date.
+    Logs are sorted once on a composite (participant, day) key and each phase is located with two binary
+    searches, so overlapping phases are supported. Returns positions into the logs and into the phases,
+    ordered by phase and then by log position.
+    """
+    codes = pd.factorize(pd.concat([pd.Series(log_ids), pd.Series(phase_ids)], ignore_index = True))[0]
+    log_codes, phase_codes = codes[:len(log_ids)], codes[len(log_ids):]
+    log_dates, start_dates, end_dates = [pd.to_datetime(pd.Series(x)) for x in [log_dates, start_dates, end_dates]]
+    log_days, start_days, end_days = [x.to_numpy(dtype = 'datetime64[D]').view('i8') for x in [log_dates, start_dates, end_dates]]
+    
+    valid_logs = np.flatnonzero((log_codes >= 0) & log_dates.notna().to_numpy())
+    valid_phases = np.flatnonzero((phase_codes >= 0) & start_dates.notna().to_numpy() & end_dates.notna().to_numpy())
+    if valid_logs.size == 0 or valid_phases.size == 0:
+        return np.array([], dtype = 'int64'), np.array([], dtype = 'int64')
+    
+    base = min(log_days[valid_logs].min(), start_days[valid_phases].min())
+    span = max(log_days[valid_logs].max(), end_days[valid_phases].max()) - base + 1
+    log_keys = log_codes[valid_logs] * span + (log_days[valid_logs] - base)
+    order = np.argsort(log_keys, kind = 'stable')
+    sorted_keys = log_keys[order]
+    order = valid_logs[order]
+    
+    phase_codes = phase_codes[valid_phases]
+    lo = np.searchsorted(sorted_keys, phase_codes * span + (start_days[valid_phases] - base), 'left')
+    hi = np.searchsorted(sorted_keys, phase_codes * span + (end_days[valid_phases] - base), 'right')
+    lengths = np.clip(hi - lo, 0, None)
+    
+    # expand every phase's [lo, hi) range of sorted logs into explicit pairs
+    phase_idx = np.repeat(valid_phases, lengths)
+    log_idx = order[np.repeat(lo - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())]
+    pairs = np.lexsort((log_idx, phase_idx))
+    return log_idx[pairs], phase_idx[pairs]
+
+def _window_bounds(phases:pd.DataFrame,
+                   buffer_time:str,
+                   h:int) -> pd.DataFrame:
+    """
+    Lower and upper float time bounds of each phase's eating window, including the buffer time.
+    """
+    # if window start or window end are nan, make the windows the same as control's window time.
+    window_start = phases['window_start'].where(phases['window_start'].notna(), datetime.time(0,0))
+    window_end = phases['window_end'].where(phases['window_end'].notna(), datetime.time(23,59,59))
+    buffer_time = pd.Timedelta(buffer_time).total_seconds()/3600.
+    window_start_daily = np.array([t.hour + t.minute / 60 - buffer_time for t in window_start])
+    window_end_daily = np.array([t.hour + t.minute / 60 + buffer_time for t in window_end])
+    # the full day window follows the shifted day, all others are compared to float times as is
+    full_day = (window_start == datetime.time(0,0)) & (window_end == datetime.time(23,59,59))
+    return pd.DataFrame({'lower': np.where(full_day, window_start_daily + h, window_start_daily),
+                         'upper': np.where(full_day, window_end_daily + h, window_end_daily)}, index = phases.index)
+
+def _flag_lwa_days(tagged:pd.DataFrame,
+                   min_log_num:int,
+                   min_separation:int) -> pd.DataFrame:
+    """
+    Flags every (phase, date) pair of caloric logs already tagged with 'phase', 'id', 'lower' and 'upper'.
+    """
+    tagged = tagged.assign(in_window = (tagged['float_time'] >= tagged['lower']) & (tagged['float_time'] <= tagged['upper']))
+    flags = tagged.groupby(['phase', 'id', 'date']).agg(log_count = ('float_time', 'size'),
+                                                        first_log = ('float_time', 'min'),
+                                                        last_log = ('float_time', 'max'),
+                                                        in_window_count = ('in_window', 'sum')).reset_index()
+    flags['good_logging'] = (flags['log_count'] >= min_log_num) & (flags['last_log'] - flags['first_log'] >= min_separation)
+    flags['good_window'] = flags['in_window_count'] == flags['log_count']
+    flags['adherent'] = flags['good_logging'] & flags['good_window']
+    return flags[['phase', 'id', 'date', 'log_count', 'good_logging', 'good_window', 'adherent']]
+
+def _lwa_day_flags(logs:pd.DataFrame,
+                   phases:pd.DataFrame,
+                   min_log_num:int,
+                   min_separation:int,
+                   buffer_time:str,
+                   h:int) -> pd.DataFrame:
+    """
+    Flags every (phase, date) pair of caloric logs in one grouped pass. logs needs 'id', 'date', 'float_time'
+    and 'food_type' columns, phases needs 'id', 'start_date', 'end_date', 'window_start' and 'window_end'
+    columns and is indexed by phase.
+    """
+    logs = logs[logs['food_type'].isin(['f','b'])]
+    log_idx, phase_idx = _tag_logs_with_phases(logs['id'], logs['date'], phases['id'],
+                                               phases['start_date'], phases['end_date'])
+    bounds = _window_bounds(phases, buffer_time, h)
+    tagged = pd.DataFrame({'phase': phases.index[phase_idx],
+                           'id': phases['id'].to_numpy()[phase_idx],
+                           'date': logs['date'].to_numpy()[log_idx],
+                           'float_time': logs['float_time'].to_numpy()[log_idx],
+                           'lower': bounds['lower'].to_numpy()[phase_idx],
+                           'upper': bounds['upper'].to_numpy()[phase_idx]})
+    return _flag_lwa_days(tagged, min_log_num, min_separation)
+
+def _lwa_counts_and_dates(flags:pd.DataFrame) -> tuple[list, list]:
+    """
+    Collapses day flags into good_lwa_day_counts style counts and lists of bad dates.
+    """
+    rows = [flags['good_logging'].sum(), flags['good_window'].sum(), (~flags['good_window']).sum(), flags['adherent'].sum()]
+    bad_dates = [list(flags.loc[~flags['good_logging'], 'date']), list(flags.loc[~flags['good_window'], 'date']),
+                 list(flags.loc[~flags['adherent'], 'date'])]
+    return rows, bad_dates
+
+def good_lwa_day_flags(food_data:pd.DataFrame,
+                       ref_tbl:pd.DataFrame,
+                       min_log_num:int = 2,
+                       min_separation:int = 5,
+                       buffer_time:str = '15 minutes',
+                       h:int = 4,
+                       identifier:int = 1,
+                       date_col:int = 6,
+                       time_col:int = 7) -> pd.DataFrame:
+    """
+    Flags 'good' logging days, 'good' window days and adherent days for every participant and study phase of a
+    reference table in a single grouped pass. Day definitions match good_lwa_day_counts.
+    
+    Parameters
+    ----------
+    food_data
+        Dataframe of food logging data. Must have a column for 'food_type' within the data. It is recommended that
+        you use find_date and find_float_time to generate necessary date and time columns for this function.
+    ref_tbl
+        Participant data reference table. See the accompanying HOWTO document for required column positions and
+        formatting.
+    min_log_num
+        Minimum number of logs required for a day to be considered a 'good' logging day.
+    min_separation
+        Minimum number of hours between first and last log on a log day for it to be considered a 'good' logging day.
+    buffer_time
+        pd.Timedelta parsable string, representing 'wiggle room' for adherence.
+    h
+        Number of hours to shift the definition of 'date' by. h = 4 would indicate that a log date begins at
+        4:00 AM and ends the following calendar day at 3:59:59. Float representations of time would therefore
+        go from 4.0 (inclusive) to 28.0 (exclusive) to represent 'date' membership for days shifted from their
+        original calendar date.
+    identifier
+        Column number for an existing unique identifier column in food_data, matching the first column of ref_tbl.
+    date_col
+        Column number for an existing date column in food_data.
+    time_col
+        Column number for an existing time column in food_data.
+    
+    
+    Returns
+    -------
+    flags
+        Long dataframe with one row per reference table row ('phase', its position in ref_tbl) and date with
+        caloric logs, containing the number of caloric logs and boolean 'good_logging', 'good_window' and
+        'adherent' columns. Days outside the assigned window are the rows where 'good_window' is False.
+    """
+    # if treets functions have been used (in any order) to generate columns
+    # find appropriate column names, if not check for expected column position
+    if 'date' in food_data.columns:
+        date_col = food_data.columns[food_data.columns.get_loc('date')]
+    else:
+        date_col = food_data.columns[date_col]
+        
+    if 'float_time' in food_data.columns:
+        time_col = food_data.columns[food_data.columns.get_loc('float_time')]
+    else:
+        time_col = food_data.columns[time_col]
     
-    df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    missing_days = []
-    for x in pd.date_range(start_date, end_date, freq='d'):
-        if x.to_pydatetime().date() not in df['date'].unique():
-            missing_days.append(x.to_pydatetime().date())
+    logs = pd.DataFrame({'id': food_data[food_data.columns[identifier]],
+                         'date': _as_datetime64_dates(food_data[date_col]),
+                         'float_time': food_data[time_col],
+                         'food_type': food_data['food_type']})
+    # column order is specified in our how-to document for data from collaborators
+    phases = pd.DataFrame({'id': ref_tbl.iloc[:, 0], 'start_date': ref_tbl.iloc[:, 4], 'end_date': ref_tbl.iloc[:, 5],
+                           'window_start': ref_tbl.iloc[:, 6], 'window_end': ref_tbl.iloc[:, 7]}).reset_index(drop = True)
     
-    return missing_days
+    return _lwa_day_flags(logs, phases, min_log_num, min_separation, buffer_time, h)
 
-# %% ../00_core.ipynb 78
+# %% ../00_core.ipynb 128
 def good_lwa_day_counts(df: pd.DataFrame,
                         window_start:datetime.time,
                         window_end:datetime.time,
@@ -1530,8 +3254,8 @@ def good_lwa_day_counts(df: pd.DataFrame,
                         min_separation:int = 5,
                         buffer_time:str = '15 minutes',
                         h:int = 4,
-                        start_date:datetime.date = "not_defined",
-                        end_date:datetime.date = "not_defined",
+                        start_date:pd.Timestamp|datetime.date = "not_defined",
+                        end_date:pd.Timestamp|datetime.date = "not_defined",
                         time_col:int = 7) -> tuple[list, list]:
     """
     Calculates the number of 'good' logging days, 'good' window days, 'outside' window days and adherent days.
@@ -1581,70 +3305,22 @@ def good_lwa_day_counts(df: pd.DataFrame,
     if pd.isnull(start_date) or pd.isnull(end_date):
         return [np.nan, np.nan, np.nan, np.nan], [[],[],[]]
     
+    dates = _as_datetime64_dates(df['date'])
+    
     # if there is no input on start_date or end_date, use earliest date and latest date
     if start_date == "not_defined":
-        start_date = df['date'].min()
+        start_date = dates.min()
     if end_date == "not_defined":
-        end_date = df['date'].max()
-    
-    # if window start or window end are nan, make the windows the same as control's window time.
-    if pd.isnull(window_start):
-        window_start = datetime.time(0,0)
-    if pd.isnull(window_end):
-        window_end = datetime.time(23,59,59)
-
-    # helper function to determine a good logging
-    def good_logging(local_time_series):
-        return len(local_time_series.values) >= min_log_num and (max(local_time_series.values) - min(local_time_series.values)) >= min_separation
-   
-    df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    df = df[df['food_type'].isin(['f','b'])]
-    df['original_logtime'] = pd.to_datetime(df['original_logtime']).dt.tz_localize(None)
-
-    buffer_time = pd.Timedelta(buffer_time).total_seconds()/3600.
-
-    in_window_count = []
-    daily_count = []
-    good_logging_count = []
-    cur_dates = df['date'].sort_values(ascending = True).unique()
-    for aday in cur_dates:
-        window_start_daily = window_start.hour + window_start.minute / 60 - buffer_time
-        window_end_daily = window_end.hour + window_end.minute / 60 + buffer_time
-        tmp = df[df['date'] == aday]
-        
-        if (window_start == datetime.time(0,0)) and (window_end == datetime.time(23,59, 59)):
-            in_window_count.append(tmp[(tmp[time_col] >= window_start_daily + h) & (tmp[time_col] <= window_end_daily + h)].shape[0])
-        else:
-            in_window_count.append(tmp[(tmp[time_col] >= window_start_daily) & (tmp[time_col] <= window_end_daily)].shape[0])
-        
-        daily_count.append(df[df['date'] == aday].shape[0])
-        good_logging_count.append(good_logging(df[df['date'] == aday][time_col]))
-
-    in_window_count = np.array(in_window_count)
-    daily_count = np.array(daily_count)
-    good_logging_count = np.array(good_logging_count)
-    good_logging_by_date = [cur_dates[i] for i, x in enumerate(good_logging_count) if not x]
-
-    good_window_days = (in_window_count==daily_count)
-    good_window_day_counts = good_window_days.sum()
-    good_window_by_date = [cur_dates[i] for i, x in enumerate(good_window_days) if not x]
-    
-    outside_window_days = in_window_count.size - good_window_days.sum()
-    good_logging_days = good_logging_count.sum()
-    if good_logging_count.size == 0:
-        adherent_day_counts = 0
-        adherent_days_by_date = []
-    else:
-        adherent_days = (good_logging_count & (in_window_count == daily_count))
-        adherent_days_by_date = [cur_dates[i] for i, x in enumerate(adherent_days) if not x]
-        adherent_day_counts = adherent_days.sum()
+        end_date = dates.max()
     
-    rows = [good_logging_days, good_window_day_counts, outside_window_days, adherent_day_counts]
-    bad_dates = [good_logging_by_date, good_window_by_date, adherent_days_by_date]
-
-    return rows, bad_dates
+    # all logs belong to a single participant and phase
+    logs = pd.DataFrame({'id': 0, 'date': dates, 'float_time': df[time_col], 'food_type': df['food_type']})
+    phases = pd.DataFrame({'id': [0], 'start_date': [start_date], 'end_date': [end_date],
+                           'window_start': [window_start], 'window_end': [window_end]})
+    flags = _lwa_day_flags(logs, phases, min_log_num, min_separation, buffer_time, h)
+    return _lwa_counts_and_dates(flags)
 
-# %% ../00_core.ipynb 84
+# %% ../00_core.ipynb 136
 def filtering_usable_data(df:pd.DataFrame,
                           num_items:int,
                           num_days:int,
@@ -1705,7 +3381,7 @@ def filtering_usable_data(df:pd.DataFrame,
     
     return df_usable, set(df_usable.unique_code.unique())
 
-# %% ../00_core.ipynb 87
+# %% ../00_core.ipynb 139
 def prepare_baseline_and_intervention_usable_data(data_source:str|pd.DataFrame,
                                                   baseline_num_items:int,
                                                   baseline_num_days:int,
@@ -1765,7 +3441,7 @@ def prepare_baseline_and_intervention_usable_data(data_source:str|pd.DataFrame,
         
     return [df_food_basline_usable_expanded, df_food_intervention_usable]
 
-# %% ../00_core.ipynb 91
+# %% ../00_core.ipynb 143
 def users_sorted_by_logging(data_source:str|pd.DataFrame,
                             food_type:list = ["f", "b", "m", "w"],
                             min_log_num:int = 2,
@@ -1821,7 +3497,7 @@ def users_sorted_by_logging(data_source:str|pd.DataFrame,
     
     return food_top_users_day_counts
 
-# %% ../00_core.ipynb 93
+# %% ../00_core.ipynb 145
 def eating_intervals_percentile(data_source:str|pd.DataFrame,
                                 identifier:int = 1,
                                 time_col:int = 7) -> pd.DataFrame:
@@ -1871,13 +3547,14 @@ def eating_intervals_percentile(data_source:str|pd.DataFrame,
         
     return ptile
 
-# %% ../00_core.ipynb 95
+# %% ../00_core.ipynb 147
 def first_cal_analysis_summary(data_source:str|pd.DataFrame,
                                min_log_num:int = 2,
                                min_separation:int = 4,
                                identifier:int = 1,
                                date_col:int = 6,
-                               time_col:int = 7) -> pd.DataFrame:
+                               time_col:int = 7,
+                               day_table:DayTable = None) -> pd.DataFrame:
     """
     Calculates the 5, 10, 25 , 50, 75, 90, 95 percentile of first caloric entry time for each participant on
     'good' logging days. It is recommended that you use find_date and find_float_time to generate necessary date and
@@ -1901,6 +3578,8 @@ def first_cal_analysis_summary(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source. 
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -1909,24 +3588,12 @@ def first_cal_analysis_summary(data_source:str|pd.DataFrame,
         Dataframe with 5, 10, 25, 50, 75, 90, 95 percentile of first caloric entry time for all participants.
     """
 
-    df = file_loader(data_source)
-    
-    # leave only the loggings in a good logging day
-    df = df[df["food_type"].isin(["f", "b"])]
-    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, identifier, date_col, time_col)
-    df = df[df['in_good_logging_day']==True]
-    
-    identifier = df.columns[identifier]
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
     
-    first_cal_series = df.groupby([identifier, date_col])[time_col].min().groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
+    # first caloric entry time of each caloric 'good' logging day
+    first_cal_series = day_table.caloric_series('first_cal', min_log_num, min_separation).groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
     first_cal_df = pd.DataFrame(first_cal_series)
     all_rows = []
     for index in first_cal_df.index:
@@ -1939,13 +3606,14 @@ def first_cal_analysis_summary(data_source:str|pd.DataFrame,
     
     return first_cal_summary_df
 
-# %% ../00_core.ipynb 97
+# %% ../00_core.ipynb 149
 def last_cal_analysis_summary(data_source:str|pd.DataFrame,
                               min_log_num:int = 2,
                               min_separation:int = 4,
                               identifier:int = 1,
                               date_col:int = 6,
-                              time_col:int = 7) -> pd.DataFrame:
+                              time_col:int = 7,
+                              day_table:DayTable = None) -> pd.DataFrame:
     """
     Calculates the 5, 10, 25 , 50, 75, 90, 95 percentile of last caloric entry time for each participant on
     'good' logging days. It is recommended that you use find_date and find_float_time to generate necessary date and
@@ -1969,6 +3637,8 @@ def last_cal_analysis_summary(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source. 
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -1977,27 +3647,12 @@ def last_cal_analysis_summary(data_source:str|pd.DataFrame,
         Dataframe with 5, 10, 25, 50, 75, 90, 95 percentile of last caloric entry time for all participants.
     """
     
-    df = file_loader(data_source)
-    
-    # leave only the loggings that are in a good logging day
-    df = df[df["food_type"].isin(["f", "b"])]
-    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, identifier, date_col, time_col)
-    df = df[df['in_good_logging_day']==True]
-    
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
     
-    last_cal_series = df.groupby([identifier, date_col])[time_col].max().groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
+    # last caloric entry time of each caloric 'good' logging day
+    last_cal_series = day_table.caloric_series('last_cal', min_log_num, min_separation).groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
     last_cal_df = pd.DataFrame(last_cal_series)
     all_rows = []
     for index in last_cal_df.index:
@@ -2011,13 +3666,14 @@ def last_cal_analysis_summary(data_source:str|pd.DataFrame,
     
     return last_cal_summary_df
 
-# %% ../00_core.ipynb 99
+# %% ../00_core.ipynb 151
 def summarize_data(data_source:str|pd.DataFrame,
                    min_log_num:int = 2,
                    min_separation:int = 4,
                    identifier:int = 1,
                    date_col:int = 6,
-                   time_col:int = 7) -> pd.DataFrame:
+                   time_col:int = 7,
+                   day_table:DayTable = None) -> pd.DataFrame:
     """
     Summarizes participant data, including number of days, total number of logs, number of food/beverage logs,
     number of medication logs, number of water logs, eating window duration information, first and last caloric log
@@ -2040,6 +3696,8 @@ def summarize_data(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
    
     Returns
@@ -2047,11 +3705,13 @@ def summarize_data(data_source:str|pd.DataFrame,
     summary
         Summary dataframe.
     """
-    df = file_loader(data_source)
-    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, identifier, date_col, time_col)
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    df = day_table.data
+    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, day_table = day_table)
     
     # first_cal variation (90%-10%)
-    first_cal_variability = first_cal_analysis_summary(df, min_log_num, min_separation, identifier, date_col, time_col).set_index('id')
+    first_cal_variability = first_cal_analysis_summary(df, min_log_num, min_separation, day_table = day_table).set_index('id')
     for col in first_cal_variability.columns:
         if col == 'id' or col == '50%':
             continue
@@ -2059,7 +3719,7 @@ def summarize_data(data_source:str|pd.DataFrame,
     first_cal_ser = first_cal_variability['90%'] - first_cal_variability['10%']
 
     # last_cal variation (90%-10%)
-    last_cal_variability = last_cal_analysis_summary(df,min_log_num, min_separation, identifier, date_col, time_col).set_index('id')
+    last_cal_variability = last_cal_analysis_summary(df, min_log_num, min_separation, day_table = day_table).set_index('id')
     for col in last_cal_variability.columns:
         if col == 'id' or col == '50%':
             continue
@@ -2067,25 +3727,15 @@ def summarize_data(data_source:str|pd.DataFrame,
     last_cal_ser = last_cal_variability['90%'] - last_cal_variability['10%']
     
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-    
-    
-    # num_days
-    num_days = df.groupby(identifier).date.nunique()
+    identifier = day_table.identifier
+    time_col = day_table.time_col
+    days = day_table.days.groupby(identifier)
 
     # num_total_items
     num_total_items = df.groupby(identifier).count().iloc[:,0]
+    
+    # num_days
+    num_days = days.size().reindex(num_total_items.index, fill_value = 0)
 
     # num_f_n_b
     num_f_n_b = get_types(df, ['f','b']).groupby(identifier).count().iloc[:,0]
@@ -2100,23 +3750,22 @@ def summarize_data(data_source:str|pd.DataFrame,
     eating_intervals = eating_intervals_percentile(df, time_col, identifier)[['2.5%','95%','duration mid 95%']]
 
     # first_cal_avg
-    first_cal_avg = df.groupby([identifier, date_col])[time_col].min().groupby(identifier).mean()
+    first_cal_avg = days['first_log'].mean()
 
     # first_cal_std
-    first_cal_std = df.groupby([identifier, date_col])[time_col].min().groupby(identifier).std()
+    first_cal_std = days['first_log'].std()
 
     # last_cal_avg
-    last_cal_avg = df.groupby([identifier, date_col])[time_col].max().groupby(identifier).mean()
+    last_cal_avg = days['last_log'].mean()
 
     # last_cal_std
-    last_cal_std = df.groupby([identifier, date_col])[time_col].max().groupby(identifier).std()
+    last_cal_std = days['last_log'].std()
 
     # eating_win_avg
     eating_win_avg = last_cal_avg - first_cal_avg
 
     # eating_win_std
-    eating_win_std = (df.groupby([identifier, date_col])[time_col].max()-
-                          df.groupby([identifier, date_col])[time_col].min()).groupby(identifier).std()
+    eating_win_std = (day_table.days['last_log'] - day_table.days['first_log']).groupby(day_table.days[identifier]).std()
     
     # good_logging_count
     good_logging_count = df.groupby(identifier)['in_good_logging_day'].sum()
@@ -2131,7 +3780,85 @@ def summarize_data(data_source:str|pd.DataFrame,
     
     return summary
 
-# %% ../00_core.ipynb 102
+# %% ../00_core.ipynb 155
+def _phase_summary_core(df:pd.DataFrame,
+                        phases:pd.DataFrame,
+                        min_log_num:int,
+                        min_separation:int,
+                        buffer_time:str,
+                        h:int) -> tuple[pd.DataFrame, dict, list]:
+    """
+    Computes the summary metrics of summarize_data_with_experiment_phases for a set of reference table rows.
+    df needs 'PID', 'date', 'float_time' and 'food_type' columns, phases needs 'id', 'start_date', 'end_date',
+    'window_start' and 'window_end' columns and is indexed by ref_tbl position. Returns the metrics indexed by
+    position, missing dates by position and bad logging, bad window and non adherent dates by position.
+    """
+    # tag every log once with each reference table row (participant, phase, window) covering its date
+    log_idx, phase_idx = _tag_logs_with_phases(df['PID'], df['date'], phases['id'], phases['start_date'], phases['end_date'])
+    bounds = _window_bounds(phases, buffer_time, h)
+    tagged = pd.DataFrame({'phase': phases.index[phase_idx],
+                           'id': phases['id'].to_numpy()[phase_idx],
+                           'date': df['date'].to_numpy()[log_idx],
+                           'float_time': df['float_time'].to_numpy()[log_idx],
+                           'food_type': df['food_type'].to_numpy()[log_idx],
+                           'lower': bounds['lower'].to_numpy()[phase_idx],
+                           'upper': bounds['upper'].to_numpy()[phase_idx]})
+    caloric = tagged[tagged['food_type'].isin(['f','b'])]
+    phase_index = phases.index.rename('phase')
+    
+    # entry counts by food type
+    type_counts = tagged.groupby(['phase', 'food_type']).size().unstack(fill_value = 0)
+    type_counts = type_counts.reindex(index = phase_index, columns = ['f', 'b', 'm', 'w'], fill_value = 0)
+    
+    # daily first, last, occasion and midpoint statistics of caloric entries and their phase averages, in one pass
+    metrics = _daily_metrics_core(phase_idx, len(phases), tagged['date'], tagged['float_time'], tagged['food_type'])
+    metrics.index = phase_index
+    
+    tmp = pd.DataFrame({'caloric_entries_num': type_counts['f'] + type_counts['b'],
+                        'medication_num': type_counts['m'],
+                        'water_num': type_counts['w'],
+                        'first_cal_avg': metrics['mean_first_cal'],
+                        'first_cal_std': metrics['std_first_cal'],
+                        'last_cal_avg': metrics['mean_last_cal'],
+                        'last_cal_std': metrics['std_last_cal'],
+                        'mean_daily_eating_window': metrics['mean_daily_eating_duration'],
+                        'std_daily_eating_window': metrics['std_daily_eating_duration'],
+                        'earliest_entry': metrics['earliest_entry'],
+                        'mean_daily_eating_occasions': metrics['mean_daily_eating_occasions'],
+                        'std_daily_eating_occasions': metrics['std_daily_eating_occasions'],
+                        'mean_daily_eating_midpoint': metrics['mean_daily_eating_midpoint'],
+                        'std_daily_eating_midpoint': metrics['std_daily_eating_midpoint'],
+                        'logging_day_counts': metrics['logging_day_counts']}, index = phase_index)
+    
+    # good logging, good window and adherent days, and the dates that fail each of them
+    day_flags = _flag_lwa_days(caloric, min_log_num, min_separation)
+    by_phase = day_flags.groupby('phase')
+    dated = phases['start_date'].notna() & phases['end_date'].notna()
+    # if start_date or end_Date is missing, the study phase is ongoing
+    tmp['good_logging_days'] = by_phase['good_logging'].sum().reindex(phase_index, fill_value = 0).where(dated)
+    tmp['good_window_days'] = by_phase['good_window'].sum().reindex(phase_index, fill_value = 0).where(dated)
+    tmp['outside_window_days'] = by_phase.size().reindex(phase_index, fill_value = 0).where(dated) - tmp['good_window_days']
+    tmp['adherent_days'] = by_phase['adherent'].sum().reindex(phase_index, fill_value = 0).where(dated)
+    bad_dates = [dict(day_flags.loc[~day_flags[x]].groupby('phase')['date'].agg(list)) for x in ['good_logging', 'good_window', 'adherent']]
+    
+    # every day of each phase without any logged entry
+    dated_phases = phases[dated]
+    phase_days = (dated_phases['end_date'] - dated_phases['start_date']).dt.days.clip(lower = -1).to_numpy() + 1
+    day_offsets = np.arange(phase_days.sum()) - np.repeat(np.cumsum(phase_days) - phase_days, phase_days)
+    all_days = pd.DataFrame({'phase': np.repeat(dated_phases.index, phase_days),
+                             'date': np.repeat(dated_phases['start_date'].to_numpy(), phase_days) + day_offsets.astype('timedelta64[D]')})
+    all_days['date'] = all_days['date'].astype(tagged['date'].dtype)
+    all_days = all_days.merge(tagged[['phase', 'date']].drop_duplicates(), how = 'left', indicator = True)
+    missing = dict(all_days[all_days['_merge'] == 'left_only'].groupby('phase')['date'].agg(list))
+    
+    
+    # 2.5% and 97.5% of each phase's caloric entries
+    tmp['2.5%'] = caloric.groupby('phase')['float_time'].quantile(.025).reindex(phase_index)
+    tmp['97.5%'] = caloric.groupby('phase')['float_time'].quantile(.975).reindex(phase_index)
+    
+    return tmp, missing, bad_dates
+
+# %% ../00_core.ipynb 156
 def summarize_data_with_experiment_phases(food_data:pd.DataFrame,
                                           ref_tbl:pd.DataFrame,
                                           min_log_num:int = 2,
@@ -2139,7 +3866,8 @@ def summarize_data_with_experiment_phases(food_data:pd.DataFrame,
                                           buffer_time:str = '15 minutes',
                                           h:int = 4,
                                           report_level:int = 2,
-                                          txt:bool = False) -> pd.DataFrame:
+                                          txt:bool = False,
+                                          n_jobs:int = 1) -> pd.DataFrame:
     """
     Summarizes participant data for each experiment phase and eating window assignment. Summary includes number of days,
     total number of logs, number of food/beverage logs, number of medication logs, number of water logs,
@@ -2170,6 +3898,9 @@ def summarize_data_with_experiment_phases(food_data:pd.DataFrame,
     txt
         If True, a text format (.txt) report will be saved in the current directory, with the name
         'treets_warning_dates.txt'
+    n_jobs
+        Number of worker processes to split participants across. -1 uses all available CPUs. Results and reports
+        are identical to a serial run.
     
     
     Returns
@@ -2189,12 +3920,10 @@ def summarize_data_with_experiment_phases(food_data:pd.DataFrame,
     
     
     
-    # checking for necessary typecasting for reference table
-    if not ref_tbl[start_day].apply(lambda x: isinstance(x, datetime.date)).all():
-        ref_tbl[start_day] = pd.to_datetime(ref_tbl[start_day]).dt.date
-        
-    if not ref_tbl[end_day].apply(lambda x: isinstance(x, datetime.date)).all():
-        ref_tbl[end_day] = pd.to_datetime(ref_tbl[end_day]).dt.date
+    # checking for necessary typecasting for reference table, on a copy to leave the caller's table untouched
+    ref_tbl = ref_tbl.copy()
+    ref_tbl[start_day] = pd.to_datetime(ref_tbl[start_day]).dt.normalize()
+    ref_tbl[end_day] = pd.to_datetime(ref_tbl[end_day]).dt.normalize()
     
     
     # preprocess to get the date and float_time column
@@ -2208,115 +3937,47 @@ def summarize_data_with_experiment_phases(food_data:pd.DataFrame,
     # reset the index of ref_tbl to avoid issues during concatenation
     ref_tbl = ref_tbl.reset_index(drop=True)
     
-    # loop through each row and get 'caloric_entries', 'mean_daily_eating_window', 'std_daily_eating_window', 'eariliest_entry', 'logging_day_counts',
-    # and 'good_logging_days', 'good_window_days', 'outside_window_days' and 'adherent_days' and find missing dates
-    matrix = []
+    phases = pd.DataFrame({'id': ref_tbl[mcc_id], 'start_date': ref_tbl[start_day], 'end_date': ref_tbl[end_day],
+                           'window_start': ref_tbl[window_start], 'window_end': ref_tbl[window_end]})
+    dated = phases['start_date'].notna() & phases['end_date'].notna()
+    df = df[['PID', 'date', 'float_time', 'food_type']]
+    
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    participants = phases['id'].unique()
+    if n_jobs > 1 and len(participants) > 1:
+        # each worker summarizes all reference table rows and logs of a disjoint set of participants
+        shards = np.array_split(participants, min(n_jobs, len(participants)))
+        summarize_shard = functools.partial(_phase_summary_core, min_log_num = min_log_num, min_separation = min_separation,
+                                            buffer_time = buffer_time, h = h)
+        with concurrent.futures.ProcessPoolExecutor(max_workers = len(shards)) as pool:
+            results = list(pool.map(summarize_shard, [df[df['PID'].isin(x)] for x in shards],
+                                    [phases[phases['id'].isin(x)] for x in shards]))
+    else:
+        results = [_phase_summary_core(df, phases, min_log_num, min_separation, buffer_time, h)]
+    
+    # merge the shards back in reference table order
+    tmp = pd.concat([x[0] for x in results]).sort_index()
+    missing = {k: v for x in results for k, v in x[1].items()}
+    bad_dates = [{k: v for x in results for k, v in x[2][i].items()} for i in range(3)]
+    
+    # participant reports are collected in reference table order
     missing_dates = {}
     bad_dates_dic = {}
-
-    for index, row in ref_tbl.iterrows():
-        id_ = row[mcc_id]
-        rows = []
-        temp_df = df[df["PID"] == id_]
-        temp_df = temp_df[(temp_df['date'] >= row[start_day]) & (temp_df['date'] <= row[end_day])]
-        # num of caloric entries
-        rows.append(count_caloric_entries(temp_df))
-        # num of medication
-        rows.append(get_types(temp_df, ['m']).shape[0])
-        # num of water
-        rows.append(get_types(temp_df, ['w']).shape[0])
-        # first cal average
-        rows.append(mean_first_cal(temp_df,'date', 'float_time'))
-        #first cal std
-        rows.append(std_first_cal(temp_df, 'date', 'float_time'))
-        # last cal average
-        rows.append(mean_last_cal(temp_df,'date', 'float_time'))
-        # last cal std
-        rows.append(std_last_cal(temp_df, 'date', 'float_time'))
-        # mean eating window
-        rows.append(mean_daily_eating_duration(temp_df,'date','float_time'))
-        
-        rows.append(std_daily_eating_duration(temp_df,'date','float_time'))
-        rows.append(earliest_entry(temp_df))
-        
-        rows.append(mean_daily_eating_occasions(temp_df, 'date', 'float_time'))
-        rows.append(std_daily_eating_occasions(temp_df, 'date', 'float_time'))
-        rows.append(mean_daily_eating_midpoint(temp_df, 'date', 'float_time'))
-        rows.append(std_daily_eating_midpoint(temp_df, 'date', 'float_time'))
-        
-        rows.append(logging_day_counts(temp_df))
-        row_day_num, bad_dates = good_lwa_day_counts(df[df["PID"]==id_]
-                                           , window_start=row[window_start]
-                                           , window_end = row[window_end]
-                                           , min_log_num=min_log_num
-                                           , min_separation=min_separation
-                                           , buffer_time= buffer_time
-                                           , start_date=row[start_day]
-                                           , end_date=row[start_day]
-                                            , h=h)
-        for x in row_day_num:
-            rows.append(x)
-        bad_logging = bad_dates[0]
-        bad_window = bad_dates[1]
-        non_adherent = bad_dates[2]
-
-        if '{}_bad_logging'.format(id_) not in bad_dates_dic:
-            bad_dates_dic['{}_bad_logging'.format(id_)]=bad_logging
-            bad_dates_dic['{}_bad_window'.format(id_)]=bad_window
-            bad_dates_dic['{}_non_adherent'.format(id_)]=non_adherent
-        else:
-            bad_dates_dic['{}_bad_logging'.format(id_)]+=bad_logging
-            bad_dates_dic['{}_bad_window'.format(id_)]+=bad_window
-            bad_dates_dic['{}_non_adherent'.format(id_)]+=non_adherent
-                
-        matrix.append(rows)
-        date_lst = find_missing_logging_days(df[df["PID"]==id_], row[start_day],row[end_day])
-        # only consider when the result is not nan
-        if isinstance(date_lst, list)==True:
-            if id_ in missing_dates:
-                missing_dates[id_] += date_lst
-            else:
-                missing_dates[id_] = date_lst
-
-    # create a temp dataframe
-    tmp = pd.DataFrame(matrix, columns = ['caloric_entries_num','medication_num', 'water_num','first_cal_avg','first_cal_std',
-                                          'last_cal_avg', 'last_cal_std', 'mean_daily_eating_window', 'std_daily_eating_window', 'earliest_entry',
-                                          'mean_daily_eating_occasions', 'std_daily_eating_occasions', 'mean_daily_eating_midpoint', 'std_daily_eating_midpoint',
-                                          'logging_day_counts','good_logging_days', 'good_window_days', 'outside_window_days', 'adherent_days'])
+    for index, (id_, has_dates) in enumerate(zip(phases['id'], dated)):
+        if has_dates:
+            missing_dates[id_] = missing_dates.get(id_, []) + missing.get(index, [])
+        for key, bad in zip(['bad_logging', 'bad_window', 'non_adherent'], bad_dates):
+            key = '{}_{}'.format(id_, key)
+            bad_dates_dic[key] = bad_dates_dic.get(key, []) + (bad.get(index, []) if has_dates else [])
     
     # concat these two tables
-    returned = pd.concat([ref_tbl, tmp], axis=1)
-    
-    # loop through each row and get 2.5%, 97.5%, duration mid 95% column
-    column_025 = []
-    column_975 = []
-    for index, row in ref_tbl.iterrows():
-        id_ = row[mcc_id]
-        temp_df = df[df["PID"] == id_]
-        temp_df = temp_df[(temp_df['date'] >= row[start_day]) & (temp_df['date'] <= row[end_day])]
-        series = eating_intervals_percentile(temp_df, 'float_time', "PID")
-        try:
-            column_025.append(series.iloc[0]['2.5%'])
-        except:
-            column_025.append(np.nan)
-        try:
-            column_975.append(series.iloc[0]['97.5%'])
-        except:
-            column_975.append(np.nan)
-    returned['2.5%'] = column_025
-    returned['97.5%'] = column_975
+    returned = pd.concat([ref_tbl, tmp.reset_index(drop = True)], axis=1)
     returned['duration mid 95%'] = returned['97.5%'] - returned['2.5%']
     
-    def convert_to_percentage(ser, col):
-        if pd.isnull(ser[col]):
-            return ser[col]
-        else:
-            return (round(ser[col]/ser['phase_duration'].days * 100, 2))
-    
     # calculate percentage for 
-    for x in returned.columns:
-        if x in ['logging_day_counts','good_logging_days', 'good_window_days', 'outside_window_days', 'adherent_days']:
-            returned['%_'+x] = returned.apply(convert_to_percentage, col = x, axis = 1)
+    for x in ['logging_day_counts','good_logging_days', 'good_window_days', 'outside_window_days', 'adherent_days']:
+        returned['%_'+x] = (returned[x] / returned['phase_duration'].dt.days * 100).round(2)
 
     # reorder the columns
     returned = returned[['mCC_ID', 'Participant_Study_ID', 'Study Phase',
@@ -2343,14 +4004,14 @@ def summarize_data_with_experiment_phases(food_data:pd.DataFrame,
                     f.write("Participant {} didn't log any food items in the following day(s):\n".format(x))
                     print("Participant {} didn't log any food items in the following day(s):".format(x))
                     for date in missing_dates[x]:
-                        f.write(str(date)+'\n')
-                        print(date)
+                        f.write(str(date.date())+'\n')
+                        print(date.date())
     else:
         for x in missing_dates:
             if len(missing_dates[x])>0:
                 print("Participant {} didn't log any food items in the following day(s):".format(x))
                 for date in missing_dates[x]:
-                    print(date)
+                    print(date.date())
                 
     if report_level == 1:
         return returned
@@ -2364,25 +4025,26 @@ def summarize_data_with_experiment_phases(food_data:pd.DataFrame,
                     f.write("Participant {} have {} day(s) in the following day(s):\n".format(strings[0], strings[1]+' '+strings[2]))
                     print("Participant {} have {} day(s) in the following day(s):".format(strings[0], strings[1]+' '+strings[2]))
                     for date in bad_dates_dic[x]:
-                        f.write(str(date)+'\n')
-                        print(date)
+                        f.write(str(date.date())+'\n')
+                        print(date.date())
     else:
         for x in bad_dates_dic:
             if len(bad_dates_dic[x])>0:
                 strings = x.split('_')
                 print("Participant {} have {} day(s) in the following day(s):".format(strings[0], strings[1]+' '+strings[2]))
                 for date in bad_dates_dic[x]:
-                    print(date)
+                    print(date.date())
     
     return returned
 
-# %% ../00_core.ipynb 105
+# %% ../00_core.ipynb 160
 def first_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
                                   min_log_num:int = 2,
                                   min_separation:int = 4,
                                   identifier:int = 1,
                                   date_col:int = 6,
-                                  time_col:int = 7) -> matplotlib.figure.Figure:
+                                  time_col:int = 7,
+                                  day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Represents mean and standard deviation of first caloric intake time for each participant
     as a scatter plot, with participants as the x-axis and time as the y-axis.
@@ -2406,6 +4068,8 @@ def first_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2413,27 +4077,14 @@ def first_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object.
     """
-    df = file_loader(data_source)
+    import matplotlib.pyplot as plt
     
-    # leave only the loggings that are in a good logging day
-    df = df[df["food_type"].isin(["f", "b"])]
-    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, identifier, date_col, time_col)
-    df = df[df['in_good_logging_day']==True]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-
-    first_cal_series = df.groupby([identifier, date_col])[time_col].min()
+    # first caloric entry time of each caloric 'good' logging day
+    first_cal_series = day_table.caloric_series('first_cal', min_log_num, min_separation)
     
     
     # find means and stds for each person
@@ -2457,13 +4108,14 @@ def first_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
     
     return fig
 
-# %% ../00_core.ipynb 107
+# %% ../00_core.ipynb 162
 def last_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
                                  min_log_num:int = 2,
                                  min_separation:int = 4,
                                  identifier:int = 1,
                                  date_col:int = 6,
-                                 time_col:int = 7) -> matplotlib.figure.Figure:
+                                 time_col:int = 7,
+                                 day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Represents mean and standard deviation of last caloric intake time for each participant
     as a scatter plot, with the x-axis as participants and the y-axis as time.
@@ -2487,6 +4139,8 @@ def last_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2494,30 +4148,14 @@ def last_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object.
     """
-    df = file_loader(data_source)
-
-    # leave only the loggings that are in a good logging day
-    df = df[df["food_type"].isin(["f", "b"])]
-    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, identifier, date_col, time_col)
-    df = df[df['in_good_logging_day']==True]
+    import matplotlib.pyplot as plt
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
-
-    first_cal_series = df.groupby([identifier, date_col])[time_col].min()
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
     
-
-    last_cal_series = df.groupby([identifier, date_col])[time_col].max()
+    # last caloric entry time of each caloric 'good' logging day
+    last_cal_series = day_table.caloric_series('last_cal', min_log_num, min_separation)
     
     
     # find means and stds for each person
@@ -2541,13 +4179,14 @@ def last_cal_mean_with_error_bar(data_source:str|pd.DataFrame,
     
     return fig
 
-# %% ../00_core.ipynb 109
+# %% ../00_core.ipynb 164
 def first_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
                                         min_log_num:int = 2,
                                         min_separation:int = 4,
                                         identifier:int = 1,
                                         date_col:int = 6,
-                                        time_col:int = 7) -> matplotlib.figure.Figure:
+                                        time_col:int = 7,
+                                        day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Calculates first caloric log time variability for 'good' logging days by subtracting 5, 10, 25, 50, 75, 90, 95
     percentile of first caloric intake time from the 50th percentile first caloric intake time.
@@ -2571,6 +4210,8 @@ def first_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2578,27 +4219,15 @@ def first_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object.    
     """
-    df = file_loader(data_source)
-        
-    # leave only the loggings in a good logging day
-    df = df[df["food_type"].isin(["f", "b"])]
-    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, identifier, date_col, time_col)
-    df = df[df['in_good_logging_day']==True]
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
     
-    first_cal_series = df.groupby([identifier, date_col])[time_col].min().groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
+    # first caloric entry time of each caloric 'good' logging day
+    first_cal_series = day_table.caloric_series('first_cal', min_log_num, min_separation).groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
     first_cal_df = pd.DataFrame(first_cal_series)
     all_rows = []
     for index in first_cal_df.index:
@@ -2622,13 +4251,14 @@ def first_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
     
     return fig
 
-# %% ../00_core.ipynb 111
+# %% ../00_core.ipynb 166
 def last_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
                                        min_log_num:int = 2,
                                        min_separation:int = 4,
                                        identifier:int = 1,
                                        date_col:int = 6,
-                                       time_col:int = 7) -> matplotlib.figure.Figure:
+                                       time_col:int = 7,
+                                       day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Calculates last caloric log time variability for 'good' logging days by subtracting 5, 10, 25, 50, 75, 90, 95
     percentile of last caloric intake time from the 50th percentile last caloric intake time.
@@ -2652,6 +4282,8 @@ def last_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2659,28 +4291,16 @@ def last_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object. 
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    df = file_loader(data_source)
-        
-    # leave only the loggings that are in a good logging day
-    df = df[df["food_type"].isin(["f", "b"])]
-    df['in_good_logging_day'] = in_good_logging_day(df, min_log_num, min_separation, identifier, date_col, time_col)
-    df = df[df['in_good_logging_day']==True]
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
     
-    last_cal_series = df.groupby([identifier, date_col])[time_col].max().groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
+    # last caloric entry time of each caloric 'good' logging day
+    last_cal_series = day_table.caloric_series('last_cal', min_log_num, min_separation).groupby(identifier).quantile([0.05, 0.10, 0.25, 0.5, 0.75, 0.90, 0.95])
     last_cal_df = pd.DataFrame(last_cal_series)
     all_rows = []
     for index in last_cal_df.index:
@@ -2704,11 +4324,12 @@ def last_cal_analysis_variability_plot(data_source:str|pd.DataFrame,
     
     return fig
 
-# %% ../00_core.ipynb 113
+# %% ../00_core.ipynb 168
 def first_cal_avg_histplot(data_source:str|pd.DataFrame,
                            identifier:int = 1,
                            date_col:int = 6,
-                           time_col:int = 7) -> matplotlib.figure.Figure:
+                           time_col:int = 7,
+                           day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Plots a histogram of average first caloric intake for all participants. It is recommended
     that you use find_date and find_float_time to generate necessary date and time columns for
@@ -2727,6 +4348,8 @@ def first_cal_avg_histplot(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2734,23 +4357,16 @@ def first_cal_avg_histplot(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object. 
     """
-    df = file_loader(data_source)
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
+    time_col = day_table.time_col
     
-    df = df.query('food_type in ["f", "b"]')
-    first_cal_time = df.groupby([identifier, date_col])[time_col].min()
+    # first caloric entry time of each day with caloric logs
+    first_cal_time = day_table.caloric_series('first_cal')
     avg_first_cal_time = first_cal_time.reset_index().groupby(identifier)[time_col].mean()
     fig, ax = plt.subplots(1, 1, figsize = (10, 10), dpi=80)
     sns.distplot(avg_first_cal_time, kde = False)
@@ -2758,13 +4374,14 @@ def first_cal_avg_histplot(data_source:str|pd.DataFrame,
     
     return fig
 
-# %% ../00_core.ipynb 115
+# %% ../00_core.ipynb 170
 def first_cal_sample_distplot(data_source:str|pd.DataFrame,
                               n:int,
                               replace:bool = False,
                               identifier:int = 1,
                               date_col:int = 6,
-                              time_col:int = 7) -> matplotlib.figure.Figure:
+                              time_col:int = 7,
+                              day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Creates a distplot for the first caloric intake time for a random selection of 'n' number of 
     participants. It is recommended that you use find_date and find_float_time to generate necessary
@@ -2787,6 +4404,8 @@ def first_cal_sample_distplot(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2794,24 +4413,16 @@ def first_cal_sample_distplot(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object. 
     """
-    df = file_loader(data_source)
-    df = df[df['food_type'].isin(['f','b'])]
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    date_col = day_table.date_col
+    time_col = day_table.time_col
     
-    first_cal_by_person = pd.DataFrame(df.groupby([identifier, date_col])\
-                                       [time_col].min())
+    # first caloric entry time of each day with caloric logs
+    first_cal_by_person = pd.DataFrame(day_table.caloric_series('first_cal'))
     fig, ax = plt.subplots(1, 1, figsize = (10, 10), dpi=80)
     
     print('Plotting distplots for the following users:')
@@ -2821,11 +4432,12 @@ def first_cal_sample_distplot(data_source:str|pd.DataFrame,
     ax.set_xlabel('Time')
     return fig
 
-# %% ../00_core.ipynb 117
+# %% ../00_core.ipynb 172
 def last_cal_avg_histplot(data_source:str|pd.DataFrame,
                           identifier:int = 1,
                           date_col:int = 6,
-                          time_col:int = 7) -> matplotlib.figure.Figure:
+                          time_col:int = 7,
+                          day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Plots a histogram of average last caloric intake for all participants. It is recommended
     that you use find_date and find_float_time to generate necessary date and time columns for
@@ -2844,6 +4456,8 @@ def last_cal_avg_histplot(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2851,23 +4465,16 @@ def last_cal_avg_histplot(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object. 
     """
-    df = file_loader(data_source)
-    df = df.query('food_type in ["f", "b"]')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    identifier = day_table.identifier
+    time_col = day_table.time_col
     
-    last_cal_time = df.groupby([identifier, date_col])[time_col].max()
+    # last caloric entry time of each day with caloric logs
+    last_cal_time = day_table.caloric_series('last_cal')
     avg_last_cal_time = last_cal_time.reset_index().groupby(identifier)[time_col].mean()
     fig, ax = plt.subplots(1, 1, figsize = (10, 10), dpi=80)
     sns.distplot(avg_last_cal_time, kde = False)
@@ -2875,13 +4482,14 @@ def last_cal_avg_histplot(data_source:str|pd.DataFrame,
     
     return fig
 
-# %% ../00_core.ipynb 119
+# %% ../00_core.ipynb 174
 def last_cal_sample_distplot(data_source:str|pd.DataFrame,
                              n:int,
                              replace:bool = False,
                              identifier:int = 1,
                              date_col:int = 6,
-                             time_col:int = 7) -> matplotlib.figure.Figure:
+                             time_col:int = 7,
+                             day_table:DayTable = None) -> matplotlib.figure.Figure:
     """
     Creates a distplot for the last caloric intake time for a random selection of 'n' number of 
     participants. It is recommended that you use find_date and find_float_time to generate necessary
@@ -2904,6 +4512,8 @@ def last_cal_sample_distplot(data_source:str|pd.DataFrame,
         Column number for an existing date column in provided data source. 
     time_col
         Column number for an existing time column in provided data source.
+    day_table
+        DayTable of data_source, reused instead of grouping the logs again. data_source is not read when it is given.
     
     
     Returns
@@ -2911,24 +4521,16 @@ def last_cal_sample_distplot(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object. 
     """
-    df = file_loader(data_source)
-    df = df[df['food_type'].isin(['f','b'])]
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     
-    identifier = df.columns[identifier]
-    # if treets functions have been used (in any order) to generate columns
-    # find appropriate column names, if not check for expected column position
-    if 'date' in df.columns:
-        date_col = df.columns[df.columns.get_loc('date')]
-    else:
-        date_col = df.columns[date_col]
-        
-    if 'float_time' in df.columns:
-        time_col = df.columns[df.columns.get_loc('float_time')]
-    else:
-        time_col = df.columns[time_col]
+    if day_table is None:
+        day_table = DayTable(data_source, identifier, date_col, time_col)
+    date_col = day_table.date_col
+    time_col = day_table.time_col
     
-    last_cal_by_person = pd.DataFrame(df.groupby([identifier, date_col])\
-                                       [time_col].max())
+    # last caloric entry time of each day with caloric logs
+    last_cal_by_person = pd.DataFrame(day_table.caloric_series('last_cal'))
     fig, ax = plt.subplots(1, 1, figsize = (10, 10), dpi=80)
     
     print('Plotting distplots for the following users:')
@@ -2939,7 +4541,7 @@ def last_cal_sample_distplot(data_source:str|pd.DataFrame,
     
     return fig
 
-# %% ../00_core.ipynb 121
+# %% ../00_core.ipynb 176
 def swarmplot(data_source:str|pd.DataFrame,
               max_loggings:int,
               identifier:int = 1,
@@ -2972,6 +4574,9 @@ def swarmplot(data_source:str|pd.DataFrame,
     fig
         Matplotlib figure object.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     
     df = file_loader(data_source)
     